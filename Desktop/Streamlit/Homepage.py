@@ -1,11 +1,9 @@
 # 1_🏠_Home_&_Data.py
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import numpy as np
-import re
 import os
+import time
+from fstreamlit import app_cache, artifacts, dtypes, loader, preview, refresh
 
 # --- Seitenkonfiguration (Muss der erste Streamlit-Befehl sein) ---
 st.set_page_config(
@@ -14,210 +12,6 @@ st.set_page_config(
     page_icon="🇪🇬"
 )
 
-# --- Caching-Funktion (Daten laden und bereinigen - von der Webseite) ---
-@st.cache_data(ttl=3600)
-def load_and_clean_data_from_web(url):
-    """
-    Scrapt Bevölkerungsdaten von der angegebenen URL, bereinigt sie und gibt ein Pandas DataFrame zurück.
-    """
-    # --- Hilfsfunktionen ---
-    def clean_numeric_column(col):
-        col_str = col.astype(str)
-        cleaned_col = col_str.str.replace(",", "", regex=False).str.strip()
-        cleaned_col = cleaned_col.replace("...", np.nan, regex=False)
-        return pd.to_numeric(cleaned_col, errors="coerce")
-
-    def clean_text_column(text):
-        if pd.isna(text): return None
-        text = str(text)
-        text = re.sub(r"[^\\w\\s\\u0600-\\u06FF\\-]", "", text)
-        text = re.sub(r"\\s+", " ", text).strip()
-        return text if text else None
-
-    def clean_column_name(col_name):
-        col_name_str = str(col_name)
-        cleaned = re.sub(r'\d{4}-\d{2}-\d{2}', '', col_name_str)
-        cleaned = re.sub(r'[()\[\]]+', '', cleaned)
-        cleaned = re.sub(r'\s+', '', cleaned).strip()
-        return cleaned
-
-    def extract_year(column_name):
-        match = re.search(r'\d{4}', str(column_name))
-        return int(match.group(0)) if match else None
-    # --- Ende Hilfsfunktionen ---
-
-    st.info(f"Fetching data from {url}...")
-    try:
-        output = requests.get(url, timeout=15)
-        output.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching URL: {e}")
-        return None
-
-    st.info("Parsing HTML content...")
-    bs_output = BeautifulSoup(markup=output.text, features="lxml")
-
-    table_output = bs_output.find(name='table', attrs={'id': 'tl'})
-    if table_output is None:
-        st.error("Data table with id='tl' not found.")
-        return None
-
-    try:
-        table_columns_raw = [x.get_text(strip=True) for x in table_output.find_all('th')]
-        table_columns = [col for col in table_columns_raw if col]
-    except Exception as e:
-        st.error(f"Error extracting table headers: {e}")
-        return None
-
-    table_body = table_output.find('tbody')
-    if table_body is None:
-         st.error("Table body (tbody) not found.")
-         return None
-
-    Egypt_AD = []
-    try:
-        rows = table_body.find_all('tr')
-        for row in rows:
-            td = row.find_all('td')
-            td_values = [val.get_text(strip=True) for val in td]
-            if td_values and td_values[-1] == '→':
-                 Egypt_AD.append(td_values[:-1])
-            elif td_values :
-                 Egypt_AD.append(td_values)
-    except Exception as e:
-        st.error(f"Error extracting table rows: {e}")
-        return None
-
-    if not Egypt_AD:
-        st.warning("No data rows extracted.")
-        return None
-
-    st.info(f"Extracted {len(Egypt_AD)} rows.")
-
-    num_data_cols = len(Egypt_AD[0]) if Egypt_AD else 0
-    if num_data_cols > 0:
-        valid_headers = [col for col in table_columns_raw if col]
-        if len(valid_headers) >= num_data_cols:
-            table_columns = valid_headers[:num_data_cols]
-        else:
-            st.warning(f"Not enough valid headers ({len(valid_headers)}). Expected {num_data_cols}. Using generic names.")
-            table_columns = [f'Column_{i+1}' for i in range(num_data_cols)]
-    else:
-        st.error("Could not determine number of data columns.")
-        return None
-
-    if len(table_columns) != num_data_cols:
-         st.error(f"Adjusted header columns ({len(table_columns)}) mismatch data columns ({num_data_cols}). Check scraping.")
-         return None
-
-    st.info("Creating DataFrame...")
-    try:
-        egypt_data = pd.DataFrame(Egypt_AD)
-        if egypt_data.shape[1] == len(table_columns):
-             egypt_data.columns = table_columns
-        else:
-             egypt_data.columns = [f'Column_{i+1}' for i in range(egypt_data.shape[1])]
-             st.warning(f"Column count ({egypt_data.shape[1]}) mismatch headers ({len(table_columns)}). Using generic column names.")
-    except Exception as e:
-        st.error(f"Error creating DataFrame: {e}")
-        return None
-
-    st.info("Cleaning data...")
-    pop_col_candidates = [col for col in egypt_data.columns if 'Population' in str(col)]
-    for col in pop_col_candidates:
-        if col in egypt_data.columns:
-            egypt_data[col] = clean_numeric_column(egypt_data[col].copy())
-
-    if 'Name' in egypt_data.columns:
-        egypt_data['Name'] = egypt_data['Name'].apply(
-            lambda x: re.sub(r'\s*\[.*?\]', '', str(x)).strip() if pd.notna(x) else x
-        )
-
-    initial_rows = len(egypt_data)
-    egypt_data = egypt_data.drop_duplicates()
-    rows_dropped = initial_rows - len(egypt_data)
-    if rows_dropped > 0:
-        st.write(f"Dropped {rows_dropped} duplicate rows.")
-
-    for col in ['Status', 'Native']:
-        if col in egypt_data.columns:
-            egypt_data[col] = egypt_data[col].apply(clean_text_column)
-
-    st.info("Handling missing values...")
-    means = {}
-    numeric_cols_to_fill = egypt_data.select_dtypes(include=np.number).columns
-    original_means = {}
-    for col in numeric_cols_to_fill:
-        col_mean = egypt_data[col].mean()
-        if pd.notna(col_mean):
-            means[col] = col_mean
-            original_col_name = col
-            for original in pop_col_candidates:
-                if clean_column_name(original) == col:
-                    original_col_name = original
-                    break
-            original_means[original_col_name] = col_mean
-            egypt_data[col] = egypt_data[col].fillna(col_mean)
-
-    modes = {}
-    for col in ['Status', 'Native']:
-         if col in egypt_data.columns and egypt_data[col].isna().sum() > 0:
-            calculated_mode = egypt_data[col].mode()
-            mode_val = 'Unknown' # Default
-            if not calculated_mode.empty:
-                mode_val = calculated_mode[0]
-            else:
-                 st.warning(f"Could not calculate mode for '{col}'. Filling NaNs with 'Unknown'.")
-            modes[col] = mode_val
-            egypt_data[col] = egypt_data[col].fillna(mode_val)
-
-    st.info("Renaming columns...")
-    column_mapping = {}
-    new_columns = []
-    original_pop_cols_map = {}
-    for col in egypt_data.columns:
-        year = extract_year(col)
-        cleaned_name_base = clean_column_name(col)
-        final_cleaned_name = cleaned_name_base
-        is_population_col = col in pop_col_candidates
-
-        if year and is_population_col:
-            new_name = f'population_{year}'
-            column_mapping[col] = new_name
-            new_columns.append(new_name)
-            original_pop_cols_map[new_name] = str(col)
-        else:
-            counter = 1
-            while final_cleaned_name in new_columns:
-                 final_cleaned_name = f"{cleaned_name_base}_{counter}"
-                 counter += 1
-            column_mapping[col] = final_cleaned_name
-            new_columns.append(final_cleaned_name)
-
-    egypt_data = egypt_data.rename(columns=column_mapping)
-
-    egypt_data.attrs['nan_fill_means'] = original_means
-    egypt_data.attrs['nan_fill_modes'] = modes
-    egypt_data.attrs['original_pop_cols_map'] = original_pop_cols_map
-
-    egypt_data.reset_index(drop=True, inplace=True)
-    st.info("Data cleaning complete.")
-    return egypt_data
-
-# --- Funktion zum Laden von GitHub (mit Caching) ---
-@st.cache_data(ttl=3600)
-def load_data_from_github(github_url):
-    """Lädt eine CSV-Datei von GitHub und gibt ein Pandas DataFrame zurück."""
-    # st.info(...) wurde hier entfernt
-    try:
-        df = pd.read_csv(github_url)
-        df.columns = [re.sub(r"[^\w\s]", "", str(col)).strip().replace(" ", "_").lower() for col in df.columns]
-        st.success("Data loaded from GitHub successfully!")
-        return df
-    except Exception as e:
-        st.warning(f"Could not load file from GitHub: {e}. Will attempt web scraping.")
-        return None
-
 # --- App Layout ---
 st.title("Egypt Population Data Analysis") # Titel ohne Emoji
 st.caption("Data Source: [City Population](https://www.citypopulation.de/en/egypt/admin/) / Pre-cleaned GitHub CSV")
@@ -226,38 +20,59 @@ st.divider()
 
 st.header("Load and Clean Data")
 
-# Definiere URLs
-web_url = "https://www.citypopulation.de/en/egypt/admin/"
-github_url = "https://raw.githubusercontent.com/Mahmoud-Ezat/Fstreamlit/master/Desktop/Streamlit/cleaned_egypt_population_wide.csv"
+# Hintergrund-Aktualisierung (einmal pro Serverprozess gestartet): Sitzungen warten nie auf das Netzwerk
+prefetcher = app_cache.prefetcher()
 
-# Überprüfe Query-Parameter für erzwungenes Neuladen
+# Überprüfe Query-Parameter für erzwungenes Neuladen - lädt im Hintergrund, der aktuelle Stand bleibt sichtbar
 query_params = st.query_params
-force_reload = query_params.get("reload", ["false"])[0].lower() == "true"
-
-# Lade-Logik: Versuche zuerst GitHub, dann Web-Scraping
-if 'cleaned_df' not in st.session_state or st.session_state['cleaned_df'] is None or force_reload:
-    if force_reload:
-        st.warning("Forcing data reload...")
-        load_data_from_github.clear()
-        load_and_clean_data_from_web.clear()
-
-    df_loaded = load_data_from_github(github_url)
-
-    if df_loaded is None:
-        st.info("GitHub load failed, attempting web scraping...")
-        with st.spinner('Fetching and cleaning data from web... Please wait.'):
-            df_loaded = load_and_clean_data_from_web(web_url)
+force_reload = query_params.get("reload", "false").lower() == "true"
+if force_reload:
+    prefetcher.request_refresh()
+    st.query_params.clear()
+    st.info("Refreshing data in the background. The current snapshot stays available meanwhile.")
+
+# Lade-Logik: veröffentlichter Stand (Snapshot) -> gebündelte CSV -> GitHub -> Web-Scraping
+if 'cleaned_df' not in st.session_state or st.session_state['cleaned_df'] is None:
+    current = prefetcher.current()
+    if current is not None:
+        df_loaded, source = current.df, current.source
+    else:
+        # Kalter Start ohne Snapshot: lokale CSV sofort; Netzwerkquellen nur, wenn es sie nicht gibt -
+        # dann parallel gestaffelt über den Coordinator des Prefetchers (teilt dessen Circuit Breaker)
+        with st.spinner('Loading data... Please wait.'):
+            df_loaded, source = loader.load_tiered([("bundled CSV", loader.read_bundled_csv)])
+            if df_loaded is None:
+                df_loaded, source = prefetcher.coordinator.load()
+                if df_loaded is not None:
+                    df_loaded = loader.prepare_loaded(df_loaded)
+        if df_loaded is not None:
+            prefetcher.publish(df_loaded, source)
 
     if df_loaded is not None:
-        st.session_state['cleaned_df'] = df_loaded
-        st.success("Data loading and cleaning complete!")
-        if force_reload:
-            st.query_params.clear()
+        # Nur eine Referenz auf die geteilte Tabelle dieser Version - keine Kopie je Sitzung
+        st.session_state['cleaned_df'] = app_cache.shared_dataset(df_loaded)
+        st.success(f"Data loading and cleaning complete! (Source: {source})")
     else:
-        st.error("Failed to load data from both GitHub and Web Scraping.")
+        st.error("Failed to load data from snapshot, bundled CSV, GitHub and Web Scraping.")
         st.session_state['cleaned_df'] = None
 else:
-    st.success("Cleaned data already in session.")
+    previous = st.session_state['cleaned_df']
+    if app_cache.latest_dataset(previous) is not previous:
+        st.success(f"Switched to the newly refreshed data (Source: {prefetcher.current().source}).")
+    else:
+        st.success("Cleaned data already in session.")
+
+# Alter des angezeigten Stands und Zustand der Hintergrund-Aktualisierung
+refresh_status = prefetcher.status()
+# Alter des ausgelieferten Stands (auch nach Rollback oder kaltem Start); die Datei-mtime nur, solange nichts veröffentlicht ist
+published = prefetcher.current()
+snapshot_age = max(time.time() - published.loaded_at, 0.0) if published is not None else loader.snapshot_age()
+status_parts = [f"Data age: {pd.Timedelta(seconds=round(snapshot_age))}" if snapshot_age is not None else "No snapshot on disk yet"]
+if refresh_status["state"] == "refreshing":
+    status_parts.append("background refresh running")
+if refresh_status["last_error"]:
+    status_parts.append(f"last refresh failed: {refresh_status['last_error']}")
+st.caption(" | ".join(status_parts))
 
 
 # --- Anzeige der Datenvorschau und Infos (NUR EINMAL) ---
@@ -265,8 +80,31 @@ if 'cleaned_df' in st.session_state and st.session_state['cleaned_df'] is not No
     df_display = st.session_state['cleaned_df']
 
     st.subheader("Preview of Cleaned Data")
-    st.dataframe(df_display.fillna("N/A"))
+    # Serverseitig paginiert: nur die sichtbare Seite (und Spalten) wird serialisiert und gesendet
+    all_columns = list(df_display.columns)
+    col_columns, col_sort, col_order, col_size = st.columns([4, 2, 1, 1])
+    preview_columns = col_columns.multiselect("Columns", all_columns, default=all_columns) or all_columns
+    preview_sort = col_sort.selectbox("Sort by", [None] + all_columns, format_func=lambda c: "(source order)" if c is None else c)
+    preview_ascending = col_order.toggle("Ascending", value=True)
+    preview_page_size = col_size.selectbox("Rows per page", preview.PAGE_SIZES, index=1)
+    n_pages = preview.page_count(len(df_display), preview_page_size)
+    preview_page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+    st.dataframe(
+        app_cache.preview_page(df_display, preview_page, preview_page_size, preview_columns, preview_sort, preview_ascending),
+        hide_index=True
+    )
     st.write(f"Shape of the cleaned data: {df_display.shape}")
+    # Download der bereinigten Tabelle (beim Klick serialisiert, je Version und Format geteilt)
+    app_cache.export_controls(df_display, {"cleaned_data": df_display}, key="home_export")
+
+    # Suche über lateinische und arabische Namen (Trigramm-Index, einmal pro Datensatz gebaut)
+    search_query = st.text_input("Search units by name (Latin or Arabic)", placeholder="e.g. Aja, مركز أجا")
+    if search_query.strip():
+        positions, scores = app_cache.search_index(df_display).search(search_query, limit=20)
+        if len(positions):
+            st.dataframe(df_display.iloc[positions].assign(score=scores), hide_index=True)
+        else:
+            st.info("No matching units found.")
 
     if 'nan_fill_means' in df_display.attrs and df_display.attrs['nan_fill_means']:
          with st.expander("NaN Filling Information (Numeric Columns - Mean, if scraped)"):
@@ -277,6 +115,39 @@ if 'cleaned_df' in st.session_state and st.session_state['cleaned_df'] is not No
          with st.expander("NaN Filling Information (Categorical Columns - Mode, if scraped)"):
              st.json(df_display.attrs['nan_fill_modes'])
 
+    memory_report = dtypes.memory_report(df_display)
+    if memory_report is not None:
+         with st.expander("Memory Usage (before/after dtype optimisation)"):
+             st.dataframe(memory_report.style.format({"before_bytes": '{:,.0f}', "after_bytes": '{:,.0f}', "saved_pct": '{:.1f}%'}))
+
+    last_refresh = refresh_status["last_refresh"]
+    if last_refresh is not None:
+         with st.expander(f"Last refresh: version {last_refresh['version']}"):
+              if last_refresh['changes'] is None:
+                   st.write("No previous version to compare with (or data unchanged).")
+              else:
+                   st.json(last_refresh['changes'])
+              st.write(f"Recomputed: {', '.join(last_refresh['recomputed']) or 'nothing'} | "
+                       f"Reused: {', '.join(last_refresh['reused']) or 'nothing'}")
+
+    versions = artifacts.list_versions()
+    if versions:
+         with st.expander("Data Versions (rollback)"):
+              current = artifacts.read_manifest()
+              st.dataframe(pd.DataFrame([
+                  {"version": m["version"], "source": m["source"], "rows": m["rows"],
+                   "created_at": pd.Timestamp(m["created_at"], unit="s").strftime("%Y-%m-%d %H:%M:%S"),
+                   "current": current is not None and m["version"] == current["version"]}
+                  for m in versions
+              ]), hide_index=True)
+              rollback_version = st.selectbox("Version", [m["version"] for m in versions])
+              if st.button("Roll back to this version"):
+                   # Alter der Daten = Erstellungszeit der zurückgeholten Version, nicht der Zeitpunkt des Rollbacks
+                   created_at = next(m["created_at"] for m in versions if m["version"] == rollback_version)
+                   rolled_back = prefetcher.publish(refresh.rollback(rollback_version), f"rollback to {rollback_version}", loaded_at=created_at)
+                   st.session_state['cleaned_df'] = app_cache.shared_dataset(rolled_back.df)
+                   st.rerun()
+
     # *** st.info-Zeile hier entfernt ***
     # st.info("Navigate to the 'Analysis' and 'Visualizations' pages using the sidebar.")
 
@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+"""Offline-Benchmarks für Laden, Parsen, Bereinigen und Analysieren."""
@@ -0,0 +1,24 @@
+# benchmarks/bench_extract.py
+"""Vergleicht die lxml/XPath-Extraktion mit dem ursprünglichen BeautifulSoup-Durchlauf.
+
+Aufruf (aus Desktop/Streamlit): python -m benchmarks.bench_extract
+"""
+import timeit
+
+from benchmarks.fixtures import load_fixture
+from fstreamlit import extract
+
+
+def run(repeats=(1, 25), number=5):
+    for repeat in repeats:
+        content = load_fixture(repeat=repeat)
+        results = {engine: extract.extract_table(content, engine) for engine in extract.ENGINES}
+        assert results["lxml"] == results["bs4"], "Engines liefern unterschiedliche Ergebnisse"
+        n_rows = results["lxml"].n_rows
+        for engine in extract.ENGINES:
+            seconds = min(timeit.repeat(lambda: extract.extract_table(content, engine), number=number, repeat=3)) / number
+            print(f"{n_rows:>8} rows  {engine:<5} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    run()
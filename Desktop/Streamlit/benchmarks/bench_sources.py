@@ -0,0 +1,101 @@
+# benchmarks/bench_sources.py
+"""Lokale Stand-in-Server (GitHub-CSV, Adminseite) mit künstlicher Latenz und Fehlern: Reihenfolge vs. Hedging, Circuit Breaker.
+
+Aufruf (aus Desktop/Streamlit): python -m benchmarks.bench_sources
+"""
+import http.server
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.fixtures import load_fixture
+from fstreamlit import fetch, loader, pipeline, sources
+
+
+class StandIn:
+    """HTTP-Server auf einem freien Port; `latency` (Sekunden) und `fail_first` (Anzahl 500er) sind änderbar."""
+
+    def __init__(self, body, content_type):
+        self.latency = 0.0
+        self.fail_first = 0
+        self.requests = 0
+        stand_in = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests += 1
+                time.sleep(stand_in.latency)
+                if stand_in.fail_first > 0:
+                    stand_in.fail_first -= 1
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def set(self, latency=0.0, fail_first=0):
+        self.latency, self.fail_first, self.requests = latency, fail_first, 0
+
+
+def _timed(load):
+    started = time.perf_counter()
+    df, source = load()
+    return time.perf_counter() - started, source, df
+
+
+def run(hedge_delay=0.5):
+    with open(loader.BUNDLED_CSV, "rb") as f:
+        github = StandIn(f.read(), "text/csv")
+    web = StandIn(load_fixture(), "text/html")
+    tiers = [
+        ("GitHub", lambda: fetch.read_remote_csv(github.url, timeout=5)),
+        ("web scraping", lambda: pipeline.scrape_and_clean(web.url)),
+    ]
+    snapshot_path = os.path.join(tempfile.mkdtemp(), "bench.arrow")
+    sequential = lambda: loader.load_tiered(tiers, snapshot_path, use_snapshot=False)
+
+    scenarios = [
+        ("both healthy", dict(), dict()),
+        ("GitHub slow (3 s)", dict(latency=3.0), dict()),
+        ("GitHub fails twice", dict(fail_first=2), dict()),
+        ("GitHub slow, web fails once", dict(latency=3.0), dict(fail_first=1)),
+    ]
+    print(f"{'scenario':<30} {'sequential':>12} {'hedged':>12}  winner")
+    for label, github_conf, web_conf in scenarios:
+        github.set(**github_conf)
+        web.set(**web_conf)
+        seq_seconds, seq_source, _ = _timed(sequential)
+        github.set(**github_conf)
+        web.set(**web_conf)
+        coordinator = sources.SourceCoordinator(tiers, hedge_delay=hedge_delay, backoff_base=0.1)
+        hedged_seconds, hedged_source, _ = _timed(coordinator.load)
+        print(f"{label:<30} {seq_seconds * 1000:9.0f} ms {hedged_seconds * 1000:9.0f} ms  {seq_source} / {hedged_source}")
+
+    # GitHub dauerhaft ausgefallen: nach FAILURE_THRESHOLD Ladevorgängen wird die Quelle übersprungen
+    print("\nGitHub down, repeated loads (circuit breaker):")
+    coordinator = sources.SourceCoordinator(tiers, hedge_delay=hedge_delay, backoff_base=0.1)
+    web.set()
+    for attempt in range(1, 6):
+        github.set(fail_first=10**6)
+        seconds, source, _ = _timed(coordinator.load)
+        state = coordinator.status()["GitHub"]["state"]
+        print(f"  load {attempt}: {seconds * 1000:6.0f} ms  source={source:<13} GitHub requests={github.requests}  breaker={state}")
+    time.sleep(0.5)  # Verlierer im Hintergrund zu Ende laufen lassen
+
+    github.server.shutdown()
+    web.server.shutdown()
+
+
+if __name__ == "__main__":
+    run()
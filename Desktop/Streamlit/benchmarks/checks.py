@@ -0,0 +1,50 @@
+# benchmarks/checks.py
+"""Regressionsprüfungen für Randfälle der schnellen Pfade (ohne Netzwerk).
+
+Aufruf (aus Desktop/Streamlit): python -m benchmarks.checks
+"""
+import numpy as np
+import pandas as pd
+
+from fstreamlit import paragraphs, ranking, timeseries
+
+
+def check_paragraphs():
+    """Ein offenes '<' oder ein kodiertes '&lt;' darf keine Nachbarabsätze verschlucken."""
+    texts = ["Growth &lt; 5% in a < b", "Urban <b>centres</b>", "Third &amp;lt; x", "Growth rural", "Fourth"]
+    expected = ["Growth 5% in a < b", "Urban centres", "Third x", "Growth rural", "Fourth"]
+    cleaned = paragraphs.clean_paragraphs(texts)
+    assert cleaned == expected, cleaned
+
+
+def check_ranking_ties(trials=500, seed=0):
+    """Gleichstände an der Grenze des Top-k/Bottom-k: gleiche Zeilen wie nlargest/nsmallest (frühere Zeile zuerst)."""
+    rng = np.random.default_rng(seed)
+    for _ in range(trials):
+        df = pd.DataFrame({"value": rng.integers(0, 5, int(rng.integers(1, 80))).astype(float)})
+        k = int(rng.integers(1, 12))
+        top, bottom = ranking.rank_extremes(df, "value", k)
+        assert list(top.index) == list(df.nlargest(k, "value").index), (df["value"].tolist(), k)
+        assert list(bottom.index) == list(df.nsmallest(k, "value").index), (df["value"].tolist(), k)
+
+
+def check_interpolate_single_year():
+    """Nur ein Zensusjahr: Werte genau in diesem Jahr, sonst NaN (kein IndexError)."""
+    units = pd.DataFrame({"name": ["a", "b"]})
+    store = timeseries.PopulationStore(units, np.array([2006]), np.array([[1.0], [2.0]]))
+    result = store.interpolate([2000, 2006, 2010])
+    assert result[2006].tolist() == [1.0, 2.0], result
+    assert result[[2000, 2010]].isna().all().all(), result
+
+
+CHECKS = [check_paragraphs, check_ranking_ties, check_interpolate_single_year]
+
+
+def run():
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
+
+
+if __name__ == "__main__":
+    run()
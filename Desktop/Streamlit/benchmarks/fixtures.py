@@ -0,0 +1,55 @@
+# benchmarks/fixtures.py
+"""Erzeugt gespeicherte HTML-Fixtures im Aufbau der citypopulation.de-Adminseite (table#tl)."""
+import html
+import os
+
+import pandas as pd
+
+from fstreamlit.loader import BUNDLED_CSV
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+EGYPT_ADMIN_HTML = os.path.join(FIXTURE_DIR, "egypt_admin.html")
+
+HEADERS = [
+    "Name", "Status", "Native",
+    "Population Census (C) 1996-11-19", "Population Census (C) 2006-11-11",
+    "Population Census (C) 2017-03-28", "Population Estimate (E) 2023-07-01", "",
+]
+
+
+def render_admin_page(df):
+    """Rendert ein DataFrame im Breitformat (name, status, native, population_*) als Adminseite."""
+    rows = []
+    for name, status, native, *pops in df.itertuples(index=False):
+        cells = "".join(f"<td>{'...' if pd.isna(v) else f'{int(v):,}'}</td>" for v in pops)
+        rows.append(
+            f'<tr><td>{html.escape(str(name))} <span class="note">[cap]</span></td>'
+            f"<td>{html.escape(str(status))}</td><td>{html.escape(str(native))}</td>"
+            f'{cells}<td><a href="#">→</a></td></tr>'
+        )
+    header_cells = "".join(f"<th>{h}</th>" for h in HEADERS)
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Egypt: Administrative Division</title>'
+        "<style>p { margin: 0; }</style><script>var tracking = 1;</script></head><body>"
+        "<p>Egypt: Governorates, Markaz &amp; Kism &ndash; population statistics.</p>"
+        f'<table id="tl"><thead><tr>{header_cells}</tr></thead><tbody>{"".join(rows)}</tbody></table>'
+        "<p>Source: CAPMAS (web).</p></body></html>"
+    )
+
+
+def load_fixture(path=EGYPT_ADMIN_HTML, repeat=1):
+    """Liest ein gespeichertes Fixture; `repeat` vervielfacht die Tabellenzeilen für größere Seiten."""
+    with open(path, "rb") as f:
+        content = f.read()
+    if repeat > 1:
+        head, rest = content.split(b"<tbody>", 1)
+        body, tail = rest.split(b"</tbody>", 1)
+        content = head + b"<tbody>" + body * repeat + b"</tbody>" + tail
+    return content
+
+
+if __name__ == "__main__":
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    with open(EGYPT_ADMIN_HTML, "w", encoding="utf-8") as f:
+        f.write(render_admin_page(pd.read_csv(BUNDLED_CSV, encoding="utf-8-sig")))
+    print(f"Wrote {EGYPT_ADMIN_HTML}")
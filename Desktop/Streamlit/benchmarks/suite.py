@@ -0,0 +1,218 @@
+# benchmarks/suite.py
+"""Benchmark-Suite: Parsen/Bereinigen, CSV-Laden, Wachstum/Ranking, Filter, Export und Diagramme über synthetische Größen.
+
+Aufruf (aus Desktop/Streamlit):
+    python -m benchmarks.suite                          # 10³..10⁵, Ergebnis nach benchmarks/results/
+    python -m benchmarks.suite --sizes 1e3 1e5 1e7      # größere Tabellen (Stufen mit Obergrenze werden übersprungen)
+    python -m benchmarks.suite --save-baseline          # aktuellen Lauf als Vergleichsbasis speichern
+    python -m benchmarks.suite --compare                # gegen die Basis prüfen; Exit-Code 1 bei Regression
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import HEADERS, load_fixture, render_admin_page
+from benchmarks.synthetic import synthetic_population
+from fstreamlit import analysis, cleaning, dtypes, export, extract, figures, filters, hierarchy, loader, pipeline, timeseries, vega_charts
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+DEFAULT_SIZES = (10**3, 10**4, 10**5)
+
+# Erlaubte relative Verschlechterung gegenüber der Basis; Diagramme schwanken stärker
+DEFAULT_THRESHOLD = 0.25
+THRESHOLDS = {"figures_mpl": 0.5, "figure_scatter_mpl": 0.5, "figure_scatter_vega": 0.5}
+MIN_DELTA_SECONDS = 0.005  # kleinere Differenzen gelten als Messrauschen
+
+
+# --- Vorbereitung ---
+def _table_data(df):
+    """TableData wie aus extract_table, ohne den (bei großen Tabellen teuren) HTML-Umweg."""
+    columns = [
+        (df["Name"].astype(str) + " [cap]").tolist(),
+        df["Status"].astype(str).tolist(),
+        df["Native"].astype(str).tolist(),
+    ]
+    for col in df.columns[3:]:
+        columns.append([("..." if np.isnan(v) else f"{int(v):,}") for v in df[col].to_numpy(dtype=float)])
+    return extract.TableData(HEADERS, columns, len(df))
+
+
+def _clean(table):
+    df, _ = cleaning.clean_table(pipeline.table_to_frame(table))
+    return df
+
+
+def _load_csv(data):
+    # wie load_data_from_github + loader.load_tiered
+    return dtypes.optimize_dtypes(loader.normalize_columns(pd.read_csv(io.BytesIO(data))))
+
+
+def _prepared(df):
+    return dtypes.optimize_dtypes(loader.normalize_columns(df))
+
+
+def _chart_inputs(df):
+    """Eingaben der Visualizations-Seite (sortiert wie dort)."""
+    results = analysis.run_analysis(_prepared(df))
+    year_cols = timeseries.year_columns(results['pop_cols_for_density'])
+    return {
+        'years': list(year_cols),
+        'density': results['population_density'][list(year_cols.values())].to_numpy(),
+        'top_growth': results['top_growth_areas'].sort_values(analysis.GROWTH_RATE_COL),
+        'bottom_growth': results['low_growth_areas'].sort_values(analysis.GROWTH_RATE_COL),
+        'top_cities': results['top_10_cities'].sort_values(analysis.POP_2023_COL, ascending=False),
+        'scatter': analysis.split_total_row(results['df_analysis_with_growth'])[0],
+    }
+
+
+def _filter_inputs(df):
+    df = _prepared(df)
+    return df, hierarchy.HierarchyIndex(timeseries.PopulationStore.from_wide(df))
+
+
+def _filter_query(df):
+    """Index einmal bauen; gemessen wird eine Kombination aus Status, Gouvernements und Bevölkerungsbereich."""
+    df, hierarchy_index = _filter_inputs(df)
+    index = filters.FilterIndex(df, hierarchy_index)
+    spec = filters.FilterSpec(
+        statuses=("Markaz", "Kism fully urban"), governorates=tuple(index.options(filters.GOVERNORATE_COL)[:10]),
+        year=2023, min_population=50_000, max_population=500_000,
+    )
+    return df, index, spec
+
+
+def _render_static(inputs):
+    figures.render(figures.density_trend(inputs['years'], inputs['density']))
+    figures.render(figures.top_growth(inputs['top_growth']))
+    figures.render(figures.bottom_growth(inputs['bottom_growth']))
+    figures.render(figures.top_cities(inputs['top_cities']))
+
+
+# Stufe -> (maximale Einheiten, Vorbereitung(df), gemessene Funktion(vorbereitet))
+STAGES = {
+    "parse": (10**5, lambda df: render_admin_page(df).encode("utf-8"), extract.extract_table),
+    "clean": (10**6, _table_data, _clean),
+    "csv_load": (10**6, lambda df: df.to_csv(index=False).encode("utf-8"), _load_csv),
+    "growth_ranking": (10**7, _prepared, analysis.growth_results),
+    "top_cities": (10**7, _prepared, analysis.top_cities_results),
+    "filter_index": (10**6, _filter_inputs, lambda data: filters.FilterIndex(*data)),
+    "filter_query": (10**6, _filter_query, lambda data: data[1].apply(data[0], data[2])),
+    "export_csv": (10**6, _prepared, lambda df: export.to_file(df, "csv")),
+    "export_parquet": (10**6, _prepared, lambda df: export.to_file(df, "parquet")),
+    "export_xlsx": (10**4, _prepared, lambda df: export.to_file(df, "xlsx")),
+    "figures_mpl": (10**5, _chart_inputs, _render_static),
+    "figure_scatter_mpl": (10**6, lambda df: _chart_inputs(df)['scatter'], lambda data: figures.render(figures.scatter_1996_2023(data))),
+    "figure_scatter_vega": (10**7, lambda df: _chart_inputs(df)['scatter'], lambda data: vega_charts.scatter_1996_2023(data).to_dict()),
+}
+
+
+# --- Messung ---
+def _repeats(n_units):
+    return 5 if n_units <= 10**4 else 3 if n_units <= 10**5 else 1
+
+
+def measure(run, data, repeat):
+    """Bestes Ergebnis aus `repeat` Läufen in Sekunden."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_suite(sizes=DEFAULT_SIZES, stages=None, log=print):
+    """Misst alle (gewählten) Stufen je Größe plus die gespeicherte HTML-Fixture; gibt Messpunkte zurück."""
+    stages = stages or list(STAGES)
+    entries = []
+
+    # Offline-Fixture der echten Seite (ohne Netzwerk)
+    content = load_fixture()
+    table = extract.extract_table(content)
+    for stage, run, data in (("fixture_parse", extract.extract_table, content), ("fixture_clean", _clean, table)):
+        seconds = measure(run, data, 5)
+        entries.append({"stage": stage, "units": table.n_rows, "seconds": seconds})
+        log(f"{stage:<20} {table.n_rows:>10,} units {seconds * 1000:10.1f} ms")
+
+    for n_units in sizes:
+        df = synthetic_population(n_units)
+        for stage in stages:
+            max_units, prepare, run = STAGES[stage]
+            if n_units > max_units:
+                continue
+            seconds = measure(run, prepare(df), _repeats(n_units))
+            entries.append({"stage": stage, "units": n_units, "seconds": seconds})
+            log(f"{stage:<20} {n_units:>10,} units {seconds * 1000:10.1f} ms")
+    return entries
+
+
+# --- Speichern und Vergleichen ---
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def save_results(entries, path=None):
+    """Speichert einen Lauf als JSON (Standard: results/run-<Zeitstempel>.json); gibt den Pfad zurück."""
+    path = path or os.path.join(RESULTS_DIR, f"run-{time.strftime('%Y%m%dT%H%M%S')}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created_at": time.time(), "environment": environment(), "results": entries}, f, indent=2)
+    return path
+
+
+def load_results(path=BASELINE_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(entries, baseline):
+    """Messpunkte, die langsamer als Basis * (1 + Schwelle) sind (und um mehr als MIN_DELTA_SECONDS)."""
+    reference = {(entry["stage"], entry["units"]): entry["seconds"] for entry in baseline}
+    regressions = []
+    for entry in entries:
+        before = reference.get((entry["stage"], entry["units"]))
+        if before is None:
+            continue
+        limit = before * (1 + THRESHOLDS.get(entry["stage"], DEFAULT_THRESHOLD))
+        if entry["seconds"] > limit and entry["seconds"] - before > MIN_DELTA_SECONDS:
+            regressions.append(dict(entry, baseline=before, ratio=entry["seconds"] / before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark loading, cleaning, analysis and chart rendering.")
+    parser.add_argument("--sizes", nargs="+", type=float, default=DEFAULT_SIZES, help="Numbers of synthetic units")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), help="Subset of stages (default: all)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the comparison baseline")
+    parser.add_argument("--compare", action="store_true", help="Fail if a stage regressed beyond its threshold")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    entries = run_suite([int(n) for n in args.sizes], args.stages)
+    print(f"Results written to {save_results(entries)}")
+    if args.save_baseline:
+        print(f"Baseline written to {save_results(entries, args.baseline)}")
+    if args.compare:
+        regressions = compare(entries, load_results(args.baseline))
+        for entry in regressions:
+            print(f"REGRESSION {entry['stage']} @ {entry['units']:,} units: "
+                  f"{entry['seconds'] * 1000:.1f} ms vs {entry['baseline'] * 1000:.1f} ms ({entry['ratio']:.2f}x)")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# benchmarks/synthetic.py
+"""Synthetische Verwaltungseinheiten im Format der gebündelten CSV (10³ bis 10⁷ Zeilen)."""
+import numpy as np
+import pandas as pd
+
+# Statusverteilung wie in der echten Tabelle (ohne die Gesamtzeile)
+STATUS_WEIGHTS = {
+    "Markaz": 169,
+    "Kism fully urban": 154,
+    "Kism urban and rural parts": 37,
+    "Governorate": 27,
+    "New City": 10,
+    "Kism fully rural": 5,
+    "Police-administrated Area": 4,
+    "Area": 1,
+}
+YEARS = (1996, 2006, 2017, 2023)
+MISSING_1996_SHARE = 0.02  # z. B. neue Städte ohne Zensuswert 1996
+
+
+def synthetic_population(n_units, seed=0, total_row=True):
+    """Breite Tabelle (Name, Status, Native, population_<Jahr>) mit n_units Einheiten plus Gesamtzeile."""
+    rng = np.random.default_rng(seed)
+    statuses = np.array(list(STATUS_WEIGHTS))
+    weights = np.fromiter(STATUS_WEIGHTS.values(), dtype=float)
+    ids = pd.Series(np.arange(n_units)).astype(str)
+
+    # Startwert log-normal, danach jährliches Wachstum je Einheit über die Zensusabstände
+    populations = np.empty((n_units, len(YEARS)))
+    populations[:, 0] = rng.lognormal(mean=11.0, sigma=1.2, size=n_units)
+    annual_growth = rng.normal(0.02, 0.015, size=n_units)
+    for i in range(1, len(YEARS)):
+        populations[:, i] = populations[:, i - 1] * (1 + annual_growth) ** (YEARS[i] - YEARS[i - 1])
+    populations = np.round(populations)
+    populations[rng.random(n_units) < MISSING_1996_SHARE, 0] = np.nan
+
+    df = pd.DataFrame({
+        "Name": "Unit " + ids,
+        "Status": statuses[rng.choice(len(statuses), size=n_units, p=weights / weights.sum())],
+        "Native": "وحدة " + ids,
+        **{f"population_{year}": populations[:, i] for i, year in enumerate(YEARS)},
+    })
+    if total_row:
+        totals = {f"population_{year}": np.nansum(populations[:, i]) for i, year in enumerate(YEARS)}
+        df.loc[len(df)] = {"Name": "Miṣr", "Status": "Republic", "Native": "مِصر", **totals}
+    return df
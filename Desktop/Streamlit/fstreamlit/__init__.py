@@ -0,0 +1,2 @@
+# fstreamlit/__init__.py
+"""Bausteine der Egypt-Population-App (Laden, Bereinigen, Analysieren); nur app_cache importiert Streamlit."""
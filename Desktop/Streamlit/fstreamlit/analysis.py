@@ -0,0 +1,110 @@
+# fstreamlit/analysis.py
+"""Analysen der Analysis-Seite ohne Streamlit (Gesamtzeile, Dichte, Top-10, Wachstumsraten)."""
+import numpy as np
+import pandas as pd
+
+from fstreamlit import ranking, telemetry, timeseries
+
+# --- Spaltennamen (Kleinbuchstaben, wie nach dem Laden) ---
+NAME_COL = 'name'
+STATUS_COL = 'status'
+NATIVE_COL = 'native'
+POP_1996_COL = 'population_1996'
+POP_2023_COL = 'population_2023'
+GROWTH_RATE_COL = 'growth_rate'
+
+TOTAL_ROW_NAME = 'miṣr'
+NATIONAL_STATUS = 'Republic'
+EGYPT_AREA_KM2 = 1002450
+TOP_K = 10
+
+
+def population_columns(df):
+    return list(timeseries.year_columns(df.columns).values())
+
+
+def has_total_row(df):
+    """Ist die letzte Zeile die Landessumme ('Miṣr' bzw. Status 'Republic')?"""
+    if len(df) == 0:
+        return False
+    last = df.iloc[-1]
+    return (NAME_COL in df.columns and str(last[NAME_COL]).lower() == TOTAL_ROW_NAME) or \
+        (STATUS_COL in df.columns and str(last[STATUS_COL]) == NATIONAL_STATUS)
+
+
+def split_total_row(df):
+    """Gibt (Gebiete ohne Gesamtzeile, Gesamtzeile der Bevölkerungsspalten oder None) zurück."""
+    if not has_total_row(df):
+        return df, None
+    return df.iloc[:-1], df[population_columns(df)].iloc[-1].astype(float)
+
+
+def population_density(total_population, area_km2=EGYPT_AREA_KM2):
+    return total_population / area_km2
+
+
+def top_cities(df_analysis, k=TOP_K, column=POP_2023_COL):
+    cols = [NAME_COL, column]
+    if STATUS_COL in df_analysis.columns:
+        cols.insert(1, STATUS_COL)
+    return ranking.top_k(df_analysis, column, k)[cols]
+
+
+def add_growth_rate(df_analysis, start_col=POP_1996_COL, end_col=POP_2023_COL):
+    """Wachstumsrate in % zwischen zwei Jahren; 0 oder NaN im Startjahr ergibt NaN."""
+    # Als float rechnen: die Bevölkerungsspalten sind vorzeichenlose nullable Ganzzahlen
+    start = df_analysis[start_col].to_numpy(dtype=float, na_value=np.nan)
+    end = df_analysis[end_col].to_numpy(dtype=float, na_value=np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth_rate = np.where(~np.isnan(start) & (start != 0), (end - start) / start * 100, np.nan)
+    return df_analysis.assign(**{GROWTH_RATE_COL: pd.Series(growth_rate, index=df_analysis.index).replace([np.inf, -np.inf], np.nan)})
+
+
+def growth_extremes(df_with_growth, k=TOP_K):
+    """Gibt (Top-k, Bottom-k) nach Wachstumsrate zurück; NaN stehen jeweils am Ende."""
+    return ranking.rank_extremes(df_with_growth, GROWTH_RATE_COL, k, na_position='last')
+
+
+# --- Ergebnisgruppen (mit deklarierten Eingaben für die inkrementelle Neuberechnung) ---
+def density_results(df):
+    _, total = split_total_row(df)
+    if total is None:
+        return {'total_population': None, 'population_density': None, 'pop_cols_for_density': None}
+    return {
+        'total_population': total,
+        'population_density': population_density(total),
+        'pop_cols_for_density': population_columns(df),
+    }
+
+
+def top_cities_results(df):
+    df_analysis, _ = split_total_row(df)
+    if df_analysis.empty or POP_2023_COL not in df_analysis.columns:
+        return {'top_10_cities': None}
+    return {'top_10_cities': top_cities(df_analysis)}
+
+
+def growth_results(df):
+    df_analysis, _ = split_total_row(df)
+    if df_analysis.empty or POP_1996_COL not in df_analysis.columns or POP_2023_COL not in df_analysis.columns:
+        return {'df_analysis_with_growth': None, 'top_growth_areas': None, 'low_growth_areas': None}
+    df_growth = add_growth_rate(df_analysis)
+    top, bottom = growth_extremes(df_growth)
+    return {'df_analysis_with_growth': df_growth, 'top_growth_areas': top, 'low_growth_areas': bottom}
+
+
+# (Name, Funktion, Zeilenbereich "total"/"areas", Eingabespalten: "population" = alle Jahre, None = alle Spalten)
+RESULT_GROUPS = [
+    ('density', density_results, 'total', 'population'),
+    ('top_cities', top_cities_results, 'areas', (NAME_COL, STATUS_COL, POP_2023_COL)),
+    ('growth', growth_results, 'areas', None),
+]
+
+
+def run_analysis(df):
+    """Führt alle Analysen der Analysis-Seite aus und gibt die Ergebnisse als dict zurück (fehlende = None)."""
+    results = {}
+    for name, compute, _, _ in RESULT_GROUPS:
+        with telemetry.span(f"analysis.{name}", rows=len(df)):
+            results.update(compute(df))
+    return results
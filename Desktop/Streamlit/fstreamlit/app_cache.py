@@ -0,0 +1,295 @@
+# fstreamlit/app_cache.py
+"""Sitzungsübergreifender Cache (SharedStore) für Datensätze und Analyseergebnisse, geschlüsselt über den Fingerprint.
+
+Einziges Modul des Pakets, das Streamlit importiert - die Headless-Pipeline (fstreamlit.build) nutzt es nicht.
+"""
+import threading
+import weakref
+
+import numpy as np
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from fstreamlit import artifacts, export, fetch, figures, filters, growth, hierarchy, loader, paragraphs, prefetch, preview, search, shared_store, telemetry, timeseries
+
+
+@st.cache_resource
+def store():
+    """Der prozessweite SharedStore (ein Datensatz je Version, abgeleitete Objekte unter globalem Budget)."""
+    return shared_store.SharedStore()
+
+
+@st.cache_resource
+def prefetcher():
+    """Hintergrund-Aktualisierung der Daten; der Worker wird einmal pro Serverprozess gestartet."""
+    return prefetch.Prefetcher().start()
+
+
+def _session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def cache_stats():
+    """Gibt {Cache-Name: {"hits", "misses", "evictions", "entries", "bytes"}} zurück."""
+    return store().stats()
+
+
+# Gefilterte Ansichten (id -> (weakref, Fingerprint)): ihr Fingerprint folgt aus Basisversion und Filter.
+# Von allen Sitzungs-Threads und den weakref-Callbacks genutzt; RLock, weil ein Callback während der
+# Garbage Collection im Thread laufen kann, der die Sperre gerade hält.
+_view_fingerprints = {}
+_view_lock = threading.RLock()
+
+
+def _forget_view(key, ref):
+    with _view_lock:
+        # Nur den eigenen Eintrag entfernen - die id kann schon an eine neue Ansicht vergeben sein
+        entry = _view_fingerprints.get(key)
+        if entry is not None and entry[0] is ref:
+            del _view_fingerprints[key]
+
+
+def _register_view(view, fingerprint):
+    key = id(view)
+    with _view_lock:
+        entry = _view_fingerprints.get(key)
+        if entry is None or entry[0]() is not view:
+            _view_fingerprints[key] = (weakref.ref(view, lambda ref: _forget_view(key, ref)), fingerprint)
+
+
+def dataset_fingerprint(df):
+    """Fingerprint des Sitzungs-Datensatzes; wird einmal pro geladenem DataFrame in der Sitzung gemerkt."""
+    with _view_lock:
+        view = _view_fingerprints.get(id(df))
+    if view is not None and view[0]() is df:
+        return view[1]
+    cached = st.session_state.get('dataset_fingerprint')
+    if cached is not None and cached[0] == id(df):
+        return cached[1]
+    fingerprint = loader.dataset_fingerprint(df)
+    st.session_state['dataset_fingerprint'] = (id(df), fingerprint)
+    return fingerprint
+
+
+def shared_dataset(df):
+    """
+    Die geteilte, unveränderliche Tabelle derselben Version wie df (bzw. df selbst, falls neu).
+    Sitzungen speichern nur diese Referenz - gleiche Versionen belegen den Speicher nur einmal.
+    """
+    fingerprint = loader.dataset_fingerprint(df)
+    shared = store().dataset(fingerprint, df, _session_id())
+    st.session_state['dataset_fingerprint'] = (id(shared), fingerprint)
+    return shared
+
+
+def latest_dataset(df):
+    """
+    Wechselt die Sitzung auf den zuletzt veröffentlichten Stand, falls der Hintergrund-Worker seit dem
+    letzten Lauf eine neue Version geladen hat (sonst df unverändert).
+    """
+    current = prefetcher().current()
+    if df is None or current is None or current.fingerprint == dataset_fingerprint(df):
+        return df
+    shared = shared_dataset(current.df)
+    st.session_state['cleaned_df'] = shared
+    return shared
+
+
+def _shared(name, df, compute, *params):
+    """Abgeleitetes Objekt `name` des Datensatzes aus dem SharedStore (berechnet bei einem Miss)."""
+    return store().get_or_compute((name, dataset_fingerprint(df), *params), compute, _session_id())
+
+
+# --- Gecachte Analysen (geteilte, unveränderliche Objekte - nicht verändern!) ---
+def _basic_statistics(df):
+    with telemetry.span("build.basic_statistics", rows=len(df)):
+        numeric_cols = df.select_dtypes(include=np.number).columns
+        return df[numeric_cols].describe() if not numeric_cols.empty else None
+
+
+def population_store(df):
+    """Langform-Speicher (unit_id, year) des Datensatzes, für alle Sitzungen geteilt."""
+    def build():
+        with telemetry.span("build.population_store", rows=len(df)):
+            return timeseries.PopulationStore.from_wide(df)
+    return _shared("population_store", df, build)
+
+
+def hierarchy_index(df):
+    """Verwaltungshierarchie mit vorberechneten Summen/Anteilen, für alle Sitzungen geteilt."""
+    def build():
+        population = population_store(df)
+        with telemetry.span("build.hierarchy_index", rows=len(df)):
+            return hierarchy.HierarchyIndex(population)
+    return _shared("hierarchy_index", df, build)
+
+
+def growth_engine(df):
+    """CAGR aller Zensusjahr-Paare und Projektionen, einmal pro Datensatzversion berechnet und geteilt."""
+    def build():
+        population = population_store(df)
+        with telemetry.span("build.growth_engine", rows=len(df)):
+            return growth.GrowthEngine(population)
+    return _shared("growth_engine", df, build)
+
+
+def filter_index(df):
+    """Status-/Gouvernement-Positionslisten und sortierte Bevölkerungswerte, einmal pro Datensatzversion gebaut und geteilt."""
+    def build():
+        hierarchy = hierarchy_index(df)
+        with telemetry.span("build.filter_index", rows=len(df)):
+            return filters.FilterIndex(df, hierarchy)
+    return _shared("filter_index", df, build)
+
+
+def filtered_dataset(df, spec):
+    """
+    Gefilterte Ansicht des Datensatzes, geteilt je Version und Filterkombination (df selbst, wenn kein Filter aktiv).
+    Alle Accessoren dieses Moduls (Analyse, Wachstum, Diagramme) cachen die Ansicht unter ihrem eigenen Fingerprint.
+    """
+    if not filters.is_active(spec):
+        return df
+    spec = filters.normalized(spec)
+    fingerprint = filters.view_fingerprint(dataset_fingerprint(df), spec)
+
+    def build():
+        index = filter_index(df)
+        with telemetry.span("build.filtered_dataset", rows=len(df)):
+            return index.apply(df, spec)
+    view = _shared("filtered_datasets", df, build, spec)
+    if view is not df:
+        _register_view(view, fingerprint)
+    return view
+
+
+def sidebar_filters(df):
+    """
+    Filter in der Seitenleiste (Status, Gouvernement, Bevölkerungsbereich); gibt die gefilterte Ansicht zurück.
+    Die Auswahl wird unter 'filter_spec' gemerkt und gilt auf allen Seiten mit Filtern.
+    """
+    index = filter_index(df)
+    saved = st.session_state.get('filter_spec', filters.FilterSpec())
+    sidebar = st.sidebar
+    sidebar.header("Filters")
+
+    statuses = sidebar.multiselect(
+        "Status", index.options(filters.STATUS_COL),
+        default=[value for value in saved.statuses if value in index.options(filters.STATUS_COL)],
+        placeholder="All", key="filter_statuses"
+    )
+    governorates = sidebar.multiselect(
+        "Governorate", index.options(filters.GOVERNORATE_COL),
+        default=[value for value in saved.governorates if value in index.options(filters.GOVERNORATE_COL)],
+        placeholder="All", key="filter_governorates"
+    )
+
+    year, min_population, max_population = None, None, None
+    years = list(index.ranges)
+    if years:
+        year = sidebar.selectbox(
+            "Population year", years, index=years.index(saved.year) if saved.year in years else len(years) - 1,
+            key="filter_year"
+        )
+        low, high = (int(value) for value in index.ranges[year].bounds())
+        if low < high:
+            selected = (
+                max(low, int(saved.min_population)) if saved.year == year and saved.min_population is not None else low,
+                min(high, int(saved.max_population)) if saved.year == year and saved.max_population is not None else high,
+            )
+            selected = sidebar.slider("Population range", low, high, selected, key=f"filter_range_{year}")
+            # Volle Spanne = kein Filter (gleicher Cache-Schlüssel wie ohne Bereich)
+            min_population = selected[0] if selected[0] > low else None
+            max_population = selected[1] if selected[1] < high else None
+
+    spec = filters.FilterSpec(tuple(statuses), tuple(governorates), year, min_population, max_population)
+    st.session_state['filter_spec'] = spec
+    view = filtered_dataset(df, spec)
+    if view is not df:
+        sidebar.caption(f"{len(view) - (len(df) - index.n_areas)} of {index.n_areas} areas match.")
+    return view
+
+
+def search_index(df):
+    """Trigramm-Suchindex über name/native, einmal pro Datensatzversion gebaut und geteilt."""
+    def build():
+        with telemetry.span("build.search_index", rows=len(df)):
+            return search.SearchIndex(df)
+    return _shared("search_index", df, build)
+
+
+def _sort_order(df, column, ascending):
+    return _shared("sort_order", df, lambda: preview.sort_order(df, column, ascending), column, ascending)
+
+
+def preview_page(df, page, page_size, columns, sort_by=None, ascending=True):
+    """Vorschau-Seite als (geteilte) Arrow-Tabelle, gecacht je Datensatzversion, Sortierung, Seite und Spalten."""
+    columns = tuple(columns)
+
+    def build():
+        order = _sort_order(df, sort_by, ascending)
+        with telemetry.span("build.preview_page", page_size=page_size):
+            return preview.page_table(df, order, page, page_size, columns)
+    return _shared("preview_pages", df, build, sort_by, ascending, page, page_size, columns)
+
+
+def analysis_results(df):
+    """Ergebnisse von analysis.run_analysis (bzw. vorberechnete Artefakte), für alle Sitzungen geteilt."""
+    def build():
+        with telemetry.span("build.analysis_results", rows=len(df)):
+            return artifacts.results_for(df)
+    return _shared("analysis_results", df, build)
+
+
+def basic_statistics(df):
+    """describe() der numerischen Spalten (None, wenn es keine gibt), für alle Sitzungen geteilt."""
+    return _shared("basic_statistics", df, lambda: _basic_statistics(df))
+
+
+def page_paragraphs(page):
+    """Bereinigte Absätze einer abgerufenen Seite, geteilt und geschlüsselt über den Inhalts-Hash (SHA-1)."""
+    def build():
+        with telemetry.span("build.paragraphs"):
+            return paragraphs.extract_paragraphs(fetch.parse_document(page, engine="lxml"))
+    return store().get_or_compute(("paragraphs", page.sha1), build, _session_id())
+
+
+# --- Gerenderte Diagramme (PNG/SVG-Bytes) ---
+def figure(chart, df, build, **params):
+    """
+    Gerenderte Bytes des Diagramms `chart`, geschlüsselt über Datensatz-Fingerprint und Parameter.
+    `build` (ohne Argumente) erzeugt die matplotlib-Figur nur bei einem Cache-Miss.
+    """
+    params = tuple(sorted(params.items()))
+
+    def render():
+        with telemetry.span("figure.matplotlib", chart=chart):
+            return figures.render(build(), fmt=dict(params).get("fmt", "png"))
+    return _shared("figures", df, render, chart, params)
+
+
+# --- Export (serialisierte Bytes, geteilt je Datensatzversion, Tabelle und Format) ---
+def export_data(df, name, table, fmt):
+    """
+    Callable für st.download_button(data=...): serialisiert erst beim Klick und teilt den Export aller Sitzungen
+    je Datensatzversion (bzw. gefilterter Ansicht), Tabelle und Format. `table` ist df oder ein daraus berechnetes Ergebnis.
+    """
+    key = ("exports", dataset_fingerprint(df), name, fmt)
+    shared, session_id = store(), _session_id()  # der Klick läuft in einem eigenen Thread ohne Skript-Kontext
+    # Geteilt wird die (ggf. auf die Platte ausgelagerte) Datei; erst der Klick liest sie als Bytes für Streamlit
+    return lambda: shared.get_or_compute(key, lambda: export.to_file(table, fmt), session_id).read()
+
+
+def export_controls(df, tables, key):
+    """Auswahl von Tabelle und Format plus Download-Button; `tables` ist {Name: DataFrame} (siehe export.analysis_tables)."""
+    col_table, col_format, col_button = st.columns([3, 2, 2], vertical_alignment="bottom")
+    name = col_table.selectbox("Table", list(tables), key=f"{key}_table") if len(tables) > 1 else next(iter(tables))
+    table = tables[name]
+    formats = [fmt for fmt in export.FORMATS if export.supported(table, fmt)]
+    fmt = col_format.segmented_control(
+        "Format", formats, format_func=str.upper, default=formats[0], required=True, key=f"{key}_format"
+    )
+    col_button.download_button(
+        f"Download {len(table):,} rows", export_data(df, name, table, fmt), file_name=export.file_name(name, fmt),
+        mime=export.FORMATS[fmt][0], on_click="ignore", icon=":material/download:", key=f"{key}_download"
+    )
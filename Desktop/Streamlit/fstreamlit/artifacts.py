@@ -0,0 +1,131 @@
+# fstreamlit/artifacts.py
+"""Versionierte, vorberechnete Artefakte (Arrow IPC) für die App: schreiben und memory-mapped lesen."""
+import json
+import os
+import time
+
+import pandas as pd
+
+from fstreamlit import analysis, loader, timeseries
+
+ARTIFACTS_DIR = os.path.join(loader.DATA_DIR, "artifacts")
+LATEST_FILE = "LATEST"
+MANIFEST_FILE = "manifest.json"
+
+# Ergebnisname aus analysis.run_analysis -> Dateiname
+TABLE_ARTIFACTS = {
+    'cleaned_df': "cleaned.arrow",
+    'df_analysis_with_growth': "growth.arrow",
+    'top_10_cities': "top_10_cities.arrow",
+    'top_growth_areas': "top_growth_areas.arrow",
+    'low_growth_areas': "low_growth_areas.arrow",
+}
+# Serien über die Bevölkerungsspalten (Index: population_<Jahr>)
+SERIES_ARTIFACTS = {
+    'total_population': "total_population.arrow",
+    'population_density': "density.arrow",
+}
+
+
+def _series_to_frame(series):
+    columns = timeseries.year_columns(series.index)
+    return pd.DataFrame({"column": list(columns.values()), "year": list(columns), "value": series[list(columns.values())].to_numpy(dtype=float)})
+
+
+def _series_from_frame(frame):
+    return pd.Series(frame["value"].to_numpy(), index=list(frame["column"]))
+
+
+def write_artifacts(df, results, source, out_dir=ARTIFACTS_DIR):
+    """Schreibt bereinigte Tabelle und Analyseergebnisse in ein neues Versionsverzeichnis; gibt das Manifest zurück."""
+    fingerprint = loader.dataset_fingerprint(df)
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{fingerprint[:12]}"
+    version_dir = os.path.join(out_dir, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    tables = dict(results, cleaned_df=df)
+    files = {}
+    for name, filename in {**TABLE_ARTIFACTS, **SERIES_ARTIFACTS}.items():
+        value = tables.get(name)
+        if value is None:
+            continue
+        if name in SERIES_ARTIFACTS:
+            value = _series_to_frame(value)
+        elif name != 'cleaned_df':
+            value = value.reset_index(drop=True)
+        loader.write_snapshot(value, os.path.join(version_dir, filename))
+        files[name] = filename
+
+    manifest = {
+        "version": version,
+        "fingerprint": fingerprint,
+        "source": source,
+        "created_at": time.time(),
+        "rows": len(df),
+        "files": files,
+    }
+    with open(os.path.join(version_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # LATEST-Zeiger zuletzt umsetzen, damit Leser nie eine halbe Version sehen
+    set_latest(version, out_dir)
+    return manifest
+
+
+def set_latest(version, out_dir=ARTIFACTS_DIR):
+    """Setzt den LATEST-Zeiger atomar auf eine vorhandene Version (auch für Rollbacks)."""
+    tmp_path = os.path.join(out_dir, f"{LATEST_FILE}.tmp-{os.getpid()}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(out_dir, LATEST_FILE))
+
+
+def list_versions(out_dir=ARTIFACTS_DIR):
+    """Manifeste aller vorhandenen Versionen, neueste zuerst."""
+    try:
+        names = sorted(os.listdir(out_dir), reverse=True)
+    except OSError:
+        return []
+    manifests = (read_manifest(name, out_dir) for name in names if os.path.isdir(os.path.join(out_dir, name)))
+    return [manifest for manifest in manifests if manifest is not None]
+
+
+def read_manifest(version=None, out_dir=ARTIFACTS_DIR):
+    """Liest das Manifest der angegebenen (Standard: neuesten) Version; None, wenn keine existiert."""
+    try:
+        if version is None:
+            with open(os.path.join(out_dir, LATEST_FILE), encoding="utf-8") as f:
+                version = f.read().strip()
+        with open(os.path.join(out_dir, version, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_artifacts(manifest, out_dir=ARTIFACTS_DIR):
+    """Lädt alle Tabellen einer Version (memory-mapped) als dict im Format von analysis.run_analysis."""
+    version_dir = os.path.join(out_dir, manifest["version"])
+    results = dict.fromkeys([*TABLE_ARTIFACTS, *SERIES_ARTIFACTS])
+    for name, filename in manifest["files"].items():
+        frame = loader.read_snapshot(os.path.join(version_dir, filename))
+        if frame is None:
+            return None
+        results[name] = _series_from_frame(frame) if name in SERIES_ARTIFACTS else frame
+    results['pop_cols_for_density'] = None
+    if results['population_density'] is not None:
+        results['pop_cols_for_density'] = list(results['population_density'].index)
+    return results
+
+
+def load_results_for(df, out_dir=ARTIFACTS_DIR):
+    """Vorberechnete Ergebnisse, falls die neueste Version zum Datensatz passt; sonst None."""
+    manifest = read_manifest(out_dir=out_dir)
+    if manifest is None or manifest["fingerprint"] != loader.dataset_fingerprint(df):
+        return None
+    return read_artifacts(manifest, out_dir)
+
+
+def results_for(df, out_dir=ARTIFACTS_DIR):
+    """Vorberechnete Ergebnisse oder - falls keine passen - frisch berechnete."""
+    results = load_results_for(df, out_dir)
+    return results if results is not None else analysis.run_analysis(df)
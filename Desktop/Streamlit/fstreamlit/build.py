@@ -0,0 +1,53 @@
+# fstreamlit/build.py
+"""Headless-Vorberechnung: laden -> bereinigen -> (inkrementell) analysieren -> versionierte Artefakte schreiben.
+
+Aufruf (aus Desktop/Streamlit, z. B. per Cron):
+    python -m fstreamlit.build [--source auto|web|github|csv] [--out DIR]
+"""
+import argparse
+import sys
+
+from fstreamlit import artifacts, fetch, loader, pipeline, refresh
+
+
+def _log(level, message):
+    print(f"[{level}] {message}", file=sys.stderr)
+
+
+def source_tiers(source, url=fetch.SOURCE_URL, github_url=loader.GITHUB_URL, log=_log):
+    """Ladestufen je Quelle; "auto" bevorzugt frische Daten (Web, GitHub) vor der gebündelten CSV. `log` erhält die Meldungen des Scrapers."""
+    tiers = {
+        "web": ("web scraping", lambda: pipeline.scrape_and_clean(url, log=log)),
+        "github": ("GitHub", lambda: fetch.read_remote_csv(github_url)),
+        "csv": ("bundled CSV", loader.read_bundled_csv),
+    }
+    if source == "auto":
+        return [tiers["web"], tiers["github"], tiers["csv"]]
+    return [tiers[source]]
+
+
+def build(source="auto", out_dir=artifacts.ARTIFACTS_DIR):
+    """Führt die komplette Pipeline aus und gibt das Manifest der neuen Version zurück (None bei Fehler)."""
+    df, used_source = loader.load_tiered(source_tiers(source), use_snapshot=False)
+    if df is None:
+        _log("error", "Failed to load data from all sources.")
+        return None
+    _log("info", f"Loaded {len(df)} rows from {used_source}.")
+    update = refresh.refresh(df, used_source, out_dir=out_dir)
+    if update.diff is not None:
+        _log("info", f"Changes since previous version: {refresh.summarize(update.diff)}")
+    _log("info", f"Recomputed: {update.recomputed or 'nothing'}; reused: {update.reused or 'nothing'}.")
+    _log("info", f"Current artifacts version {update.manifest['version']} in {out_dir}.")
+    return update.manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute cleaned data and analysis artifacts for the Streamlit app.")
+    parser.add_argument("--source", choices=["auto", "web", "github", "csv"], default="auto")
+    parser.add_argument("--out", default=artifacts.ARTIFACTS_DIR, help="Artifacts directory")
+    args = parser.parse_args(argv)
+    return 0 if build(args.source, args.out) is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
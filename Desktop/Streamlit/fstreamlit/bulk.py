@@ -0,0 +1,133 @@
+# fstreamlit/bulk.py
+"""Paralleles Scrapen mehrerer citypopulation.de-Länderseiten mit Rate-Limit pro Host.
+
+Aufruf (aus Desktop/Streamlit):
+    python -m fstreamlit.bulk https://www.citypopulation.de/en/egypt/admin/ ... [--out DIR] [--workers 4] [--delay 2.0]
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fstreamlit import loader, pipeline
+
+BULK_DIR = os.path.join(loader.DATA_DIR, "bulk")
+COUNTRY_COL = 'country'
+DEFAULT_WORKERS = 4
+DEFAULT_DELAY = 2.0  # Sekunden zwischen zwei Anfragen an denselben Host
+DEFAULT_JITTER = 0.5
+
+
+class HostRateLimiter:
+    """Vergibt pro Host Zeitfenster im Abstand von mindestens `min_interval` (+ zufälliger Jitter)."""
+
+    def __init__(self, min_interval=DEFAULT_DELAY, jitter=DEFAULT_JITTER):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval + random.uniform(0, self.jitter)
+        time.sleep(max(0.0, slot - now))
+
+
+def country_from_url(url):
+    """'https://www.citypopulation.de/en/egypt/admin/' -> 'egypt' (sonst ein Hash der URL)."""
+    parts = [p for p in urlparse(url).path.split('/') if p]
+    if len(parts) >= 2 and parts[-1] == 'admin':
+        return parts[-2]
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+
+
+def _log(level, message):
+    print(f"[{level}] {message}", file=sys.stderr)
+
+
+def scrape_many(urls, max_workers=DEFAULT_WORKERS, limiter=None, log=_log):
+    """
+    Scrapt und bereinigt alle URLs parallel (Thread-Pool) mit derselben Pipeline wie die App.
+    Gibt ({Land: DataFrame} aller erfolgreichen Seiten, {Land: Fehlermeldung}) zurück; Spalten wie population_<Jahr>.
+    Ein Fehler bei einem Land (Abruf, Parsen, Bereinigung) verwirft die übrigen Ergebnisse nicht.
+    """
+    limiter = limiter or HostRateLimiter()
+
+    def scrape(url):
+        limiter.wait(url)
+        country = country_from_url(url)
+        return pipeline.scrape_and_clean(url, log=lambda level, message: log(level, f"{country}: {message}"))
+
+    frames, failures = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(scrape, url): url for url in urls}
+        for future in as_completed(futures):
+            country = country_from_url(futures[future])
+            try:
+                df = future.result()
+            except Exception as e:
+                failures[country] = f"{type(e).__name__}: {e}"
+                log("error", f"{country}: {failures[country]}")
+                continue
+            if df is not None and not df.empty:
+                frames[country] = loader.normalize_columns(df)
+            else:
+                failures[country] = "no data"
+    return frames, failures
+
+
+def write_partitioned(frames, out_dir=BULK_DIR):
+    """Schreibt je Land eine Parquet-Partition (Hive-Layout: country=<Land>/part-0.parquet)."""
+    for country, df in frames.items():
+        partition_dir = os.path.join(out_dir, f"{COUNTRY_COL}={country}")
+        os.makedirs(partition_dir, exist_ok=True)
+        path = os.path.join(partition_dir, "part-0.parquet")
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+        os.replace(tmp_path, path)
+
+
+def read_partitioned(out_dir=BULK_DIR, countries=None):
+    """Liest die Partitionen zu einem DataFrame (Vereinigung der Jahres-Spalten) mit Spalte 'country'."""
+    frames = []
+    for entry in sorted(os.listdir(out_dir)) if os.path.isdir(out_dir) else []:
+        if not entry.startswith(f"{COUNTRY_COL}="):
+            continue
+        country = entry.split("=", 1)[1]
+        if countries is not None and country not in countries:
+            continue
+        df = pq.read_table(os.path.join(out_dir, entry, "part-0.parquet")).to_pandas()
+        df.insert(0, COUNTRY_COL, country)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[COUNTRY_COL])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape several citypopulation.de admin pages into a partitioned dataset.")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--out", default=BULK_DIR)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--delay", type=float, default=DEFAULT_DELAY, help="Minimum seconds between requests to one host")
+    args = parser.parse_args(argv)
+    frames, failures = scrape_many(args.urls, args.workers, HostRateLimiter(args.delay))
+    write_partitioned(frames, args.out)
+    _log("info", f"Wrote {len(frames)} of {len(args.urls)} countries to {args.out}.")
+    for country, error in sorted(failures.items()):
+        _log("warning", f"Skipped {country}: {error}")
+    return 0 if len(frames) == len(args.urls) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# fstreamlit/cleaning.py
+"""Vektorisierte Bereinigung der gescrapten Spalten über eine deklarative Regeltabelle."""
+import re
+
+import pandas as pd
+
+# --- Vorkompilierte Muster ---
+THOUSANDS_RE = re.compile(r",")
+BRACKET_RE = re.compile(r"\s*\[.*?\]")
+TEXT_STRIP_RE = re.compile(r"[^\w\s\u0600-\u06FF\-]")
+WHITESPACE_RE = re.compile(r"\s+")
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+BRACKET_CHARS_RE = re.compile(r"[()\[\]]+")
+YEAR_RE = re.compile(r"\d{4}")
+
+
+# --- Regeln (je eine vektorisierte Kette pro Spalte) ---
+def clean_numeric(col):
+    """'1,234,567' -> 1234567; '...' und sonstiger Text -> NaN."""
+    return pd.to_numeric(col.str.replace(THOUSANDS_RE, "", regex=True).str.strip(), errors="coerce")
+
+
+def strip_brackets(col):
+    """Entfernt Anmerkungen in eckigen Klammern ('Ajā [cap]' -> 'Ajā')."""
+    return col.str.replace(BRACKET_RE, "", regex=True).str.strip()
+
+
+def clean_text(col):
+    """Behält Wortzeichen, Leerzeichen, Arabisch und '-'; leere Ergebnisse werden zu NaN."""
+    cleaned = col.str.replace(TEXT_STRIP_RE, "", regex=True).str.replace(WHITESPACE_RE, " ", regex=True).str.strip()
+    return cleaned.mask(cleaned == "")
+
+
+RULES = {
+    "numeric": clean_numeric,
+    "strip_brackets": strip_brackets,
+    "text": clean_text,
+}
+
+# (Prädikat auf den Spaltennamen, Regel, nach dem Entfernen von Duplikaten?) - in dieser Reihenfolge angewendet
+COLUMN_RULES = [
+    (lambda col: 'Population' in str(col), "numeric", False),
+    (lambda col: col == 'Name', "strip_brackets", False),
+    (lambda col: col in ('Status', 'Native'), "text", True),
+]
+
+FILL_MODE_COLUMNS = ('Status', 'Native')
+
+
+def _apply_rules(df, after_dedupe):
+    for matches, rule, late in COLUMN_RULES:
+        if late != after_dedupe:
+            continue
+        for col in [c for c in df.columns if matches(c)]:
+            df[col] = RULES[rule](df[col])
+
+
+# --- Spaltennamen ---
+def clean_column_name(col_name):
+    cleaned = DATE_RE.sub('', str(col_name))
+    cleaned = BRACKET_CHARS_RE.sub('', cleaned)
+    return WHITESPACE_RE.sub('', cleaned).strip()
+
+
+def extract_year(column_name):
+    match = YEAR_RE.search(str(column_name))
+    return int(match.group(0)) if match else None
+
+
+def rename_columns(df, pop_cols):
+    """Bevölkerungsspalten -> population_<Jahr>; übrige Namen bereinigt und eindeutig gemacht."""
+    column_mapping = {}
+    new_columns = []
+    original_pop_cols_map = {}
+    for col in df.columns:
+        year = extract_year(col)
+        if year and col in pop_cols:
+            new_name = f'population_{year}'
+            original_pop_cols_map[new_name] = str(col)
+        else:
+            base = new_name = clean_column_name(col)
+            counter = 1
+            while new_name in new_columns:
+                new_name = f"{base}_{counter}"
+                counter += 1
+        column_mapping[col] = new_name
+        new_columns.append(new_name)
+    return df.rename(columns=column_mapping), original_pop_cols_map
+
+
+# --- Pipeline ---
+def clean_table(df):
+    """
+    Bereinigt das rohe Tabellen-DataFrame (Zellen als Text) vollständig vektorisiert.
+    Gibt (bereinigtes DataFrame, Anzahl entfernter Duplikate) zurück; Füllwerte und
+    Spaltenzuordnung stehen in df.attrs wie bisher.
+    """
+    pop_cols = [col for col in df.columns if 'Population' in str(col)]
+    _apply_rules(df, after_dedupe=False)
+
+    initial_rows = len(df)
+    df = df.drop_duplicates()
+    rows_dropped = initial_rows - len(df)
+
+    _apply_rules(df, after_dedupe=True)
+
+    # Fehlende Werte: Mittelwert für numerische, Modus für kategoriale Spalten
+    means = df.select_dtypes(include="number").mean().dropna()
+    modes = {}
+    for col in FILL_MODE_COLUMNS:
+        if col in df.columns and df[col].isna().any():
+            calculated_mode = df[col].mode()
+            modes[col] = calculated_mode.iloc[0] if not calculated_mode.empty else 'Unknown'
+    df = df.fillna({**means.to_dict(), **modes})
+
+    df, original_pop_cols_map = rename_columns(df, pop_cols)
+    df.attrs['nan_fill_means'] = means.to_dict()
+    df.attrs['nan_fill_modes'] = modes
+    df.attrs['original_pop_cols_map'] = original_pop_cols_map
+    return df.reset_index(drop=True), rows_dropped
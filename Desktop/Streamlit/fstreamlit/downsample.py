@@ -0,0 +1,49 @@
+# fstreamlit/downsample.py
+"""Serverseitiges Ausdünnen großer Reihen/Punktwolken vor dem Senden an den Browser."""
+import numpy as np
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: wählt `threshold` Punkte, die die Form der Linie erhalten.
+    Gibt die Positionen der ausgewählten Punkte zurück (erster und letzter Punkt immer enthalten).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        avg_start, avg_end = int((i + 1) * every) + 1, min(int((i + 2) * every) + 1, n)
+        avg_x, avg_y = x[avg_start:avg_end].mean(), y[avg_start:avg_end].mean()
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def _grid_bins(values, side):
+    lo, hi = values.min(), values.max()
+    span = hi - lo if hi > lo else 1.0
+    return np.minimum(((values - lo) / span * side).astype(np.int64), side - 1)
+
+
+def grid_downsample(df, x, y, max_points=5000):
+    """
+    Punktwolke auf ein Raster von etwa `max_points` Zellen reduzieren: je belegter Zelle bleibt
+    der erste Punkt erhalten, die Spalte 'count' zählt die zusammengefassten Punkte. NaN-Punkte entfallen.
+    """
+    if len(df) <= max_points:
+        return df.assign(count=1)
+    side = max(int(np.sqrt(max_points)), 1)
+    xv = df[x].to_numpy(dtype=float)
+    yv = df[y].to_numpy(dtype=float)
+    valid = np.flatnonzero(~(np.isnan(xv) | np.isnan(yv)))
+    cells = _grid_bins(xv[valid], side) * side + _grid_bins(yv[valid], side)
+    _, first, counts = np.unique(cells, return_index=True, return_counts=True)
+    return df.iloc[valid[first]].assign(count=counts)
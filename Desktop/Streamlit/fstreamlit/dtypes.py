@@ -0,0 +1,53 @@
+# fstreamlit/dtypes.py
+"""Kompakte Datentypen für die bereinigte Tabelle (Ganzzahl-Bevölkerung, Kategorien, Arrow-Strings)."""
+import numpy as np
+import pandas as pd
+
+from fstreamlit import timeseries
+
+CATEGORY_COLUMNS = ('status',)
+ARROW_STRING_COLUMNS = ('name', 'native')
+MEMORY_ATTR = 'memory_usage'
+
+
+def _population_dtype(values):
+    """Kleinster passender nullable Ganzzahltyp für (gerundete) Bevölkerungszahlen."""
+    if values.dropna().empty:
+        return "UInt32"
+    lo, hi = values.min(), values.max()
+    if lo < 0:
+        return "Int64"
+    return "UInt32" if hi <= np.iinfo(np.uint32).max else "UInt64"
+
+
+def optimize_dtypes(df):
+    """
+    Gibt eine Kopie mit kompakten Typen zurück: population_* -> UInt32 (gerundet, nullable),
+    status -> category, name/native -> Arrow-Strings. Der Speicherbedarf vorher/nachher steht in attrs.
+    """
+    before = df.memory_usage(deep=True, index=False)
+    pop_cols = set(timeseries.year_columns(df.columns).values())
+    converted = {}
+    for col in df.columns:
+        if col in pop_cols:
+            values = pd.to_numeric(df[col], errors="coerce").round()
+            converted[col] = values.astype(_population_dtype(values))
+        elif col in CATEGORY_COLUMNS:
+            converted[col] = df[col].astype("category")
+        elif col in ARROW_STRING_COLUMNS:
+            converted[col] = df[col].astype(pd.StringDtype("pyarrow"))
+    optimized = df.assign(**converted)
+    after = optimized.memory_usage(deep=True, index=False)
+    optimized.attrs[MEMORY_ATTR] = {"before": before.to_dict(), "after": after.to_dict()}
+    return optimized
+
+
+def memory_report(df):
+    """Tabelle Spalte -> Bytes vorher/nachher (inkl. Summe) aus den attrs; None, wenn nicht vorhanden."""
+    usage = df.attrs.get(MEMORY_ATTR)
+    if not usage:
+        return None
+    report = pd.DataFrame({"before_bytes": usage["before"], "after_bytes": usage["after"]})
+    report.loc["total"] = report.sum()
+    report["saved_pct"] = (1 - report["after_bytes"] / report["before_bytes"]) * 100
+    return report
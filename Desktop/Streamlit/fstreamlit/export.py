@@ -0,0 +1,118 @@
+# fstreamlit/export.py
+"""Export bereinigter Daten und Analyseergebnisse als CSV, Parquet oder XLSX - blockweise in einen Binär-Stream."""
+import tempfile
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+from fstreamlit import telemetry
+
+CHUNK_ROWS = 50_000
+SPOOL_MAX_BYTES = 8 * 1024**2  # größere Exporte werden in eine temporäre Datei statt in den Speicher geschrieben
+XLSX_MAX_ROWS = 1_048_576 - 1  # Excel-Grenze abzüglich Kopfzeile
+
+# Format -> (MIME-Typ, Dateiendung)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+# --- Schreiber (je Block; nie der ganze Datensatz als Text/Tabelle auf einmal) ---
+def write_csv(df, sink, chunk_rows=CHUNK_ROWS):
+    """UTF-8 mit BOM (wie die gebündelte CSV, damit Excel die arabischen Namen richtig liest)."""
+    sink.write(df.head(0).to_csv(index=False).encode("utf-8-sig"))
+    for chunk in _chunks(df, chunk_rows):
+        sink.write(chunk.to_csv(index=False, header=False).encode("utf-8"))
+
+
+def write_parquet(df, sink, chunk_rows=CHUNK_ROWS):
+    """Ein Row-Group je Block; das Schema wird einmal aus dem ganzen DataFrame bestimmt (alle Blöcke gleich)."""
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_xlsx(df, sink, chunk_rows=CHUNK_ROWS, sheet_name="data"):
+    """openpyxl im Write-only-Modus: Zeilen werden direkt in das Arbeitsblatt gestreamt."""
+    if len(df) > XLSX_MAX_ROWS:
+        raise ValueError(f"{len(df):,} rows exceed the Excel limit of {XLSX_MAX_ROWS:,}.")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append([str(col) for col in df.columns])
+    for chunk in _chunks(df, chunk_rows):
+        # Fehlende Werte (NaN/pd.NA) als leere Zellen; Kategorien/nullable Ganzzahlen als Python-Objekte
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(sink)
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet, "xlsx": write_xlsx}
+
+
+def supported(df, fmt):
+    return fmt != "xlsx" or len(df) <= XLSX_MAX_ROWS
+
+
+def write(df, fmt, sink, chunk_rows=CHUNK_ROWS):
+    """Schreibt df im Format `fmt` in einen binären Stream (Datei, SpooledTemporaryFile, ...)."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from {', '.join(WRITERS)}.")
+    with telemetry.span(f"export.{fmt}", rows=len(df)):
+        WRITERS[fmt](df, sink, chunk_rows)
+
+
+class ExportFile:
+    """Serialisierter Export in einer SpooledTemporaryFile; von allen Sitzungen geteilt, read() liefert den ganzen Inhalt."""
+
+    def __init__(self, spool, size):
+        self._spool = spool
+        self._lock = threading.Lock()
+        self.size = size
+
+    @property
+    def nbytes(self):
+        """Im Arbeitsspeicher gehaltene Bytes (für das Budget des SharedStore); 0, sobald auf die Platte ausgelagert."""
+        return self.size if self.size <= SPOOL_MAX_BYTES else 0
+
+    def read(self):
+        with self._lock:
+            self._spool.seek(0)
+            return self._spool.read()
+
+
+def to_file(df, fmt, chunk_rows=CHUNK_ROWS):
+    """Schreibt df blockweise in eine SpooledTemporaryFile - nie zwei volle Kopien im Speicher."""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    write(df, fmt, spool, chunk_rows)
+    return ExportFile(spool, spool.tell())
+
+
+def file_name(name, fmt):
+    return f"{name}.{FORMATS[fmt][1]}"
+
+
+# --- Exportierbare Tabellen ---
+def analysis_tables(df, results):
+    """{Name: DataFrame} aus bereinigten Daten und Analyseergebnissen (fehlende Ergebnisse werden ausgelassen)."""
+    tables = {"cleaned_data": df}
+    if results.get('population_density') is not None:
+        tables["population_density"] = pd.DataFrame({
+            "total_population": results['total_population'],
+            "density_per_km2": results['population_density'],
+        }).rename_axis("column").reset_index()
+    for name in ('top_10_cities', 'df_analysis_with_growth', 'top_growth_areas', 'low_growth_areas'):
+        if results.get(name) is not None:
+            tables[name] = results[name]
+    return tables
@@ -0,0 +1,95 @@
+# fstreamlit/extract.py
+"""Extraktion der Tabelle `table#tl` in Spalten-Arrays (lxml/XPath, BeautifulSoup als Fallback)."""
+from collections import namedtuple
+from itertools import zip_longest
+
+ARROW_CELL = '→'
+DEFAULT_ENGINE = "lxml"
+
+TableData = namedtuple("TableData", ["headers", "columns", "n_rows"])
+
+
+class ExtractionError(ValueError):
+    """Tabelle oder Tabellenkörper nicht gefunden."""
+
+
+def _to_columns(headers, rows):
+    """Entfernt die abschließende '→'-Zelle, überspringt leere Zeilen und transponiert in Spalten."""
+    data_rows = []
+    for values in rows:
+        if values and values[-1] == ARROW_CELL:
+            data_rows.append(values[:-1])
+        elif values:
+            data_rows.append(values)
+    columns = [list(col) for col in zip_longest(*data_rows)]
+    return TableData(headers, columns, len(data_rows))
+
+
+def parse_lxml(content):
+    """Parst HTML-Bytes/-Text mit lxml.html (Bytes werden als UTF-8 dekodiert, sonst per UnicodeDammit)."""
+    import lxml.html
+
+    if isinstance(content, bytes):
+        try:
+            content = content.decode("utf-8")
+        except UnicodeDecodeError:
+            from bs4 import UnicodeDammit
+            content = UnicodeDammit(content).unicode_markup
+    return lxml.html.fromstring(content)
+
+
+# --- Engines ---
+def _extract_lxml(content):
+    """XPath direkt auf dem lxml-Baum - kein BeautifulSoup-Objektbaum."""
+    root = content if hasattr(content, "xpath") else parse_lxml(content)
+    tables = root.xpath('//table[@id="tl"]')
+    if not tables:
+        raise ExtractionError("Data table with id='tl' not found.")
+    table = tables[0]
+    # Wie get_text(strip=True): jedes Textfragment trimmen und ohne Trenner verbinden
+    headers = ["".join(t.strip() for t in th.itertext()) for th in table.iter('th')]
+    bodies = table.xpath('./tbody')
+    if not bodies:
+        raise ExtractionError("Table body (tbody) not found.")
+    rows = (
+        ["".join(t.strip() for t in td.itertext()) for td in tr.iterchildren('td')]
+        for tr in bodies[0].iter('tr')
+    )
+    return _to_columns(headers, rows)
+
+
+def _extract_bs4(content):
+    """Ursprünglicher BeautifulSoup-Baumdurchlauf (Fallback und Referenz für Benchmarks)."""
+    from bs4 import BeautifulSoup
+
+    soup = content if hasattr(content, "find_all") else BeautifulSoup(content, "lxml")
+    table = soup.find(name='table', attrs={'id': 'tl'})
+    if table is None:
+        raise ExtractionError("Data table with id='tl' not found.")
+    headers = [x.get_text(strip=True) for x in table.find_all('th')]
+    body = table.find('tbody')
+    if body is None:
+        raise ExtractionError("Table body (tbody) not found.")
+    rows = ([val.get_text(strip=True) for val in row.find_all('td')] for row in body.find_all('tr'))
+    return _to_columns(headers, rows)
+
+
+ENGINES = {
+    "lxml": _extract_lxml,
+    "bs4": _extract_bs4,
+}
+
+
+def extract_table(content, engine=DEFAULT_ENGINE):
+    """
+    Extrahiert `table#tl` aus HTML-Bytes/-Text (oder einem bereits geparsten Dokument der Engine).
+    Fällt auf BeautifulSoup zurück, wenn die gewählte Engine nicht verfügbar ist oder scheitert.
+    """
+    try:
+        return ENGINES[engine](content)
+    except ExtractionError:
+        raise
+    except Exception:
+        if engine == "bs4" or not isinstance(content, (bytes, str)):
+            raise
+        return _extract_bs4(content)
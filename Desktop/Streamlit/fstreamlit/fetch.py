@@ -0,0 +1,137 @@
+# fstreamlit/fetch.py
+"""Gemeinsamer HTTP-Abruf: gepoolte Session, Antwortspeicher auf der Platte, ETag/Last-Modified-Revalidierung."""
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import requests
+import pandas as pd
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from fstreamlit.extract import parse_lxml
+from fstreamlit.loader import DATA_DIR
+
+# --- Konfiguration ---
+SOURCE_URL = "https://www.citypopulation.de/en/egypt/admin/"
+DEFAULT_TIMEOUT = 15
+STORE_DIR = os.path.join(DATA_DIR, "http")
+MAX_PARSED_DOCUMENTS = 4
+
+Page = namedtuple("Page", ["url", "content", "etag", "last_modified", "sha1", "revalidated"])
+
+_session = None
+_session_lock = threading.Lock()
+_documents = OrderedDict()  # (sha1, engine) -> geparstes Dokument (geteilt zwischen Tabellen- und Absatz-Extraktion)
+_documents_lock = threading.Lock()
+
+
+def get_session():
+    """Gibt die prozessweite, gepoolte requests.Session zurück."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "Fstreamlit/1.0 (+https://github.com/Mahmoud-Ezat/Fstreamlit)"
+            _session = session
+        return _session
+
+
+# --- Antwortspeicher auf der Platte ---
+def _store_paths(url, store_dir):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(store_dir, f"{key}.body"), os.path.join(store_dir, f"{key}.json")
+
+
+def _read_stored(url, store_dir):
+    body_path, meta_path = _store_paths(url, store_dir)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            content = f.read()
+    except (OSError, ValueError):
+        return None
+    return meta, content
+
+
+def _write_stored(url, store_dir, meta, content):
+    os.makedirs(store_dir, exist_ok=True)
+    body_path, meta_path = _store_paths(url, store_dir)
+    for path, data, mode in ((body_path, content, "wb"), (meta_path, json.dumps(meta), "w")):
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"  # Hintergrund-Worker und parallele Quellen schreiben gleichzeitig
+        with open(tmp_path, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+# --- Abruf ---
+def fetch_page(url=SOURCE_URL, timeout=DEFAULT_TIMEOUT, store_dir=STORE_DIR):
+    """
+    Ruft die URL über die gepoolte Session ab und revalidiert dabei eine gespeicherte Antwort
+    (If-None-Match / If-Modified-Since). Bei 304 wird der gespeicherte Inhalt zurückgegeben.
+    Netzwerkfehler werden als requests.exceptions.RequestException weitergereicht.
+    """
+    stored = _read_stored(url, store_dir)
+    headers = {}
+    if stored is not None:
+        meta, _ = stored
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = get_session().get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and stored is not None:
+        meta, content = stored
+        return Page(url, content, meta.get("etag"), meta.get("last_modified"), meta["sha1"], True)
+    response.raise_for_status()
+
+    content = response.content
+    meta = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "sha1": hashlib.sha1(content).hexdigest(),
+    }
+    try:
+        _write_stored(url, store_dir, meta, content)
+    except OSError:
+        pass  # Speicher ist optional
+    return Page(url, content, meta["etag"], meta["last_modified"], meta["sha1"], False)
+
+
+def read_remote_csv(url, timeout=DEFAULT_TIMEOUT):
+    """CSV über die gepoolte Session mit Timeout laden (pd.read_csv(url) hätte keinen); Fehler werden weitergereicht."""
+    response = get_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return pd.read_csv(io.BytesIO(response.content), encoding="utf-8-sig")
+
+
+def parse_document(page, engine="bs4"):
+    """
+    Parst den Seiteninhalt einmal pro Engine ("bs4" -> BeautifulSoup, "lxml" -> lxml.html-Baum);
+    gleicher Inhalt liefert dasselbe Dokument-Objekt. Die Dokumente sind geteilt und dürfen nicht verändert werden.
+    """
+    key = (page.sha1, engine)
+    with _documents_lock:
+        if key in _documents:
+            _documents.move_to_end(key)
+            return _documents[key]
+    doc = parse_lxml(page.content) if engine == "lxml" else BeautifulSoup(page.content, "lxml")
+    with _documents_lock:
+        _documents[key] = doc
+        while len(_documents) > MAX_PARSED_DOCUMENTS:
+            _documents.popitem(last=False)
+    return doc
+
+
+def get_document(url=SOURCE_URL, timeout=DEFAULT_TIMEOUT, engine="bs4"):
+    """Abruf + geteiltes Parsen in einem Schritt. Gibt (Page, Dokument) zurück."""
+    page = fetch_page(url, timeout=timeout)
+    return page, parse_document(page, engine)
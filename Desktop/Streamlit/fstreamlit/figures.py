@@ -0,0 +1,110 @@
+# fstreamlit/figures.py
+"""Matplotlib/Seaborn-Diagramme der Visualizations-Seite als Funktionen + Rendern zu PNG/SVG-Bytes."""
+import io
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import matplotlib.ticker as mticker
+import numpy as np
+import seaborn as sns
+
+from fstreamlit.analysis import GROWTH_RATE_COL, NAME_COL, POP_1996_COL, POP_2023_COL
+
+_thousands = mticker.FuncFormatter(lambda x, p: format(int(x), ','))
+
+
+def render(fig, fmt="png", dpi=100):
+    """Rendert die Figur in Bytes und schließt sie (keine Figuren bleiben im Speicher)."""
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi)
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def density_trend(years, density_values):
+    fig, ax = plt.subplots(figsize=(7, 5))
+    ax.plot(years, density_values, marker='o', color='b', linestyle='-', linewidth=2, markersize=8)
+    ax.set_xlabel('Year')
+    ax.set_ylabel("Population Density (persons/km²)")
+    ax.set_title("Population Density in Egypt Over the Years")
+    ax.grid(True)
+    ax.set_xticks(years)
+    ax.yaxis.set_major_formatter(mticker.FormatStrFormatter('%d'))
+    return fig
+
+
+def population_projection(years, values, projection_years, projected_values, title):
+    fig, ax = plt.subplots(figsize=(7, 5))
+    ax.plot(years, values, marker='o', color='b', linestyle='-', linewidth=2, markersize=8, label='Census / estimate')
+    ax.plot([years[-1], *projection_years], [values[-1], *projected_values], marker='o', color='orange', linestyle='--', linewidth=2, markersize=8, label='Projection')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Population')
+    ax.set_title(title)
+    ax.grid(True)
+    ax.legend()
+    ax.yaxis.set_major_formatter(_thousands)
+    return fig
+
+
+def top_growth(top_growth_sorted):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(y=NAME_COL, x=GROWTH_RATE_COL, data=top_growth_sorted, hue=NAME_COL, palette='viridis', legend=False, ax=ax, dodge=False)
+    ax.set_xlabel('Growth Rate (%)')
+    ax.set_ylabel('Area')
+    ax.set_title('Top 10 Areas by Population Growth Rate (1996 - 2023)')
+    ax.grid(axis='x', linestyle='--', alpha=0.5)
+    ax.xaxis.set_major_formatter(mticker.FormatStrFormatter('%.1f%%'))
+    fig.tight_layout()
+    return fig
+
+
+def bottom_growth(low_growth_plot):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    bars = ax.barh(low_growth_plot[NAME_COL], low_growth_plot[GROWTH_RATE_COL], color='salmon')
+    ax.bar_label(bars, fmt='%.1f%%', padding=3)
+    ax.set_xlabel('Growth Rate (%)', fontsize=12)
+    ax.set_ylabel('Area', fontsize=12)
+    ax.set_title('Bottom 10 Areas by Population Growth Rate (1996 - 2023)', fontsize=14)
+    ax.grid(axis='x', linestyle='--', alpha=0.5)
+    ax.xaxis.set_major_formatter(mticker.FormatStrFormatter('%.1f%%'))
+    fig.tight_layout()
+    return fig
+
+
+def top_cities(top_10_cities_sorted):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    colors = plt.cm.viridis(np.linspace(0, 1, len(top_10_cities_sorted)))
+    ax.bar(top_10_cities_sorted[NAME_COL], top_10_cities_sorted[POP_2023_COL], color=colors)
+    ax.set_xlabel('City/Area')
+    ax.set_ylabel('Population in 2023')
+    ax.set_title('Top 10 Cities/Areas by Population in 2023')
+    ax.tick_params(axis='x', labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+    ax.grid(axis='y', linestyle='--', alpha=0.5)
+    ax.yaxis.set_major_formatter(_thousands)
+    fig.tight_layout()
+    return fig
+
+
+def scatter_1996_2023(df_for_scatter):
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.scatterplot(data=df_for_scatter, x=POP_1996_COL, y=POP_2023_COL, color='dodgerblue', edgecolor='black', alpha=0.7, ax=ax)
+    ax.set_title('Population in 1996 vs 2023 (Excluding Egypt Total if identified)')
+    ax.set_xlabel('Population 1996')
+    ax.set_ylabel('Population 2023')
+    ax.grid(True, linestyle='--', alpha=0.5)
+    xlims = ax.get_xlim()
+    ylims = ax.get_ylim()
+    lims = [min(xlims[0], ylims[0]), max(xlims[1], ylims[1])]
+    ax.plot(lims, lims, 'r--', alpha=0.75, zorder=0, label='y=x (No Change)')
+    ax.set_xlim(lims)
+    ax.set_ylim(lims)
+    ax.legend()
+    ax.xaxis.set_major_formatter(_thousands)
+    ax.yaxis.set_major_formatter(_thousands)
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,121 @@
+# fstreamlit/filters.py
+"""Filter nach Status, Gouvernement und Bevölkerungsbereich über vorberechnete Indizes, kombiniert als Bitmasken."""
+import hashlib
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from fstreamlit import timeseries
+from fstreamlit.analysis import STATUS_COL, has_total_row
+
+GOVERNORATE_COL = 'governorate'
+
+# Leere Auswahl bzw. None bedeutet "keine Einschränkung"; hashbar, damit sie als Cache-Schlüssel taugt
+FilterSpec = namedtuple(
+    "FilterSpec", ["statuses", "governorates", "year", "min_population", "max_population"],
+    defaults=((), (), None, None, None),
+)
+
+
+def is_active(spec):
+    return bool(spec.statuses or spec.governorates) or (
+        spec.year is not None and (spec.min_population is not None or spec.max_population is not None))
+
+
+def normalized(spec):
+    """Gleiche Auswahl, gleicher Schlüssel: ohne Bereichsgrenzen spielt das Jahr keine Rolle."""
+    if spec.min_population is None and spec.max_population is None:
+        return spec._replace(year=None)
+    return spec
+
+
+def view_fingerprint(base_fingerprint, spec):
+    """Fingerprint einer gefilterten Ansicht: aus Basisversion und Filter, ohne die Werte erneut zu hashen."""
+    return hashlib.sha1(f"{base_fingerprint}|{tuple(spec)!r}".encode("utf-8")).hexdigest()
+
+
+class CategoryIndex:
+    """Zeilenpositionen je Wert (invertierte Liste): eine Sortierung beim Aufbau, Abfragen sind nur Slices."""
+
+    def __init__(self, codes, values):
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        self.values = list(values)
+        self._positions = {value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(self.values)}
+
+    def mask(self, selected, n):
+        """Bitmaske der Zeilen mit einem der gewählten Werte (ODER über die Positionslisten)."""
+        mask = np.zeros(n, dtype=bool)
+        for value in selected:
+            mask[self._positions.get(value, slice(0, 0))] = True
+        return mask
+
+
+class RangeIndex:
+    """Sortierte Werte einer Bevölkerungsspalte; ein Bereich sind zwei Binärsuchen (NaN fällt bei jedem Bereich heraus)."""
+
+    def __init__(self, values):
+        valid = np.flatnonzero(~np.isnan(values))
+        order = np.argsort(values[valid])  # Reihenfolge bei Gleichstand egal - Treffer werden in eine Maske gestreut
+        self._order = valid[order]
+        self._sorted = values[self._order]
+
+    def bounds(self):
+        return (float(self._sorted[0]), float(self._sorted[-1])) if len(self._sorted) else (0.0, 0.0)
+
+    def mask(self, low, high, n):
+        start = 0 if low is None else np.searchsorted(self._sorted, low, side="left")
+        stop = len(self._sorted) if high is None else np.searchsorted(self._sorted, high, side="right")
+        mask = np.zeros(n, dtype=bool)
+        mask[self._order[start:stop]] = True
+        return mask
+
+
+class FilterIndex:
+    """
+    Indizes über die Gebietszeilen (ohne Landessumme) eines Datensatzes: je Status und Gouvernement die
+    Zeilenpositionen, je Zensusjahr die sortierten Werte. Ein Filter wird zu Bitmasken, die mit & kombiniert werden.
+    Einmal je Datensatzversion gebaut (app_cache.filter_index).
+    """
+
+    def __init__(self, df, hierarchy):
+        self.n_areas = len(df) - 1 if has_total_row(df) else len(df)
+        n = self.n_areas
+
+        self.categories = {}
+        if STATUS_COL in df.columns:
+            codes, values = pd.factorize(df[STATUS_COL].iloc[:n], sort=True)
+            self.categories[STATUS_COL] = CategoryIndex(codes, [str(value) for value in values])
+        if hierarchy.governorates:
+            self.categories[GOVERNORATE_COL] = CategoryIndex(hierarchy.governorate_code[:n], hierarchy.governorates)
+
+        self.ranges = {
+            year: RangeIndex(df[col].iloc[:n].to_numpy(dtype=float, na_value=np.nan))
+            for year, col in timeseries.year_columns(df.columns).items()
+        }
+
+    def options(self, column):
+        return self.categories[column].values if column in self.categories else []
+
+    def mask(self, spec):
+        """Bitmaske der Gebietszeilen, die alle Bedingungen erfüllen (None: kein Filter aktiv)."""
+        masks = []
+        for column, selected in ((STATUS_COL, spec.statuses), (GOVERNORATE_COL, spec.governorates)):
+            if selected and column in self.categories:
+                masks.append(self.categories[column].mask(selected, self.n_areas))
+        if spec.year in self.ranges and (spec.min_population is not None or spec.max_population is not None):
+            masks.append(self.ranges[spec.year].mask(spec.min_population, spec.max_population, self.n_areas))
+        if not masks:
+            return None
+        return np.logical_and.reduce(masks) if len(masks) > 1 else masks[0]
+
+    def apply(self, df, spec):
+        """Gefilterte Gebietszeilen in Originalreihenfolge; eine Landessumme bleibt als letzte Zeile erhalten."""
+        mask = self.mask(spec)
+        if mask is None:
+            return df
+        positions = np.flatnonzero(mask)
+        if len(df) > self.n_areas:
+            positions = np.append(positions, self.n_areas)
+        return df.iloc[positions]
@@ -0,0 +1,98 @@
+# fstreamlit/growth.py
+"""Mehrperioden-Wachstum: CAGR für alle Paare von Zensusjahren und Projektionen, vektorisiert über alle Gebiete."""
+import numpy as np
+import pandas as pd
+
+from fstreamlit import timeseries
+
+PROJECTION_YEARS = (2030, 2040, 2050)
+START_COL = 'start_year'
+END_COL = 'end_year'
+CAGR_COL = 'cagr'
+
+
+def pairwise_cagr(matrix, years):
+    """
+    CAGR als (Gebiete x Startjahr x Endjahr)-Array in einem Broadcast: (Ende / Start) ** (1 / Jahre) - 1.
+    Nur für Endjahr > Startjahr; Startwert <= 0 oder NaN bzw. Endwert < 0 oder NaN ergeben NaN.
+    """
+    years = np.asarray(years, dtype=float)
+    start = matrix[:, :, None]
+    end = matrix[:, None, :]
+    span = years[None, :] - years[:, None]  # [i, j] = Jahr j - Jahr i
+    valid = (span > 0)[None] & (start > 0) & (end >= 0)  # Vergleiche mit NaN sind False
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        rates = np.power(end / start, 1.0 / span[None]) - 1
+    return np.where(valid, rates, np.nan)
+
+
+def project(matrix, years, rates, start, end, target_years):
+    """
+    Projektionen (Gebiete x Zieljahre) für ein Paar (Positionen start < end): Endwert fortgeschrieben mit dessen CAGR.
+    Ziele vor dem Endjahr werden ebenfalls berechnet (Rückschreibung).
+    """
+    offsets = np.asarray(target_years, dtype=float) - float(years[end])
+    with np.errstate(invalid="ignore", over="ignore"):
+        return matrix[:, end, None] * np.power(1 + rates[:, start, end, None], offsets[None])
+
+
+class GrowthEngine:
+    """
+    CAGR aller Zensusjahr-Paare und Projektionen für alle Gebiete eines PopulationStore.
+    Einmal je Datensatzversion gebaut (app_cache.growth_engine); Projektionen werden erst für ein abgefragtes
+    Paar berechnet und dann je Paar gemerkt.
+    """
+
+    def __init__(self, store, projection_years=PROJECTION_YEARS):
+        self.store = store
+        self.years = store.years
+        self.projection_years = tuple(projection_years)
+        self.rates = pairwise_cagr(store.matrix(), self.years)
+        self._projections = {}  # (Start, Ende) -> Gebiete x projection_years
+
+    @classmethod
+    def from_wide(cls, df, projection_years=PROJECTION_YEARS):
+        return cls(timeseries.PopulationStore.from_wide(df), projection_years)
+
+    def _pair(self, start_year, end_year):
+        if start_year >= end_year:
+            raise ValueError(f"Start year {start_year} must be before end year {end_year}.")
+        return self.store._year_position(start_year), self.store._year_position(end_year)
+
+    def pairs(self):
+        """Alle (Startjahr, Endjahr)-Paare mit Startjahr < Endjahr."""
+        i, j = np.triu_indices(len(self.years), k=1)
+        return list(zip(self.years[i].tolist(), self.years[j].tolist()))
+
+    # --- Abfragen ---
+    def cagr(self, start_year, end_year):
+        """CAGR in % je Gebiet für ein beliebiges Paar von Zensusjahren."""
+        i, j = self._pair(start_year, end_year)
+        return pd.Series(self.rates[:, i, j] * 100, index=self.store.units.index, name=f"cagr_{start_year}_{end_year}")
+
+    def cagr_matrix(self, unit_id):
+        """CAGR in % eines Gebiets für alle Paare (Zeilen: Startjahr, Spalten: Endjahr)."""
+        return pd.DataFrame(self.rates[unit_id] * 100, index=self.years, columns=self.years)
+
+    def rates_long(self):
+        """Langform aller Paare: unit_id, start_year, end_year, cagr (in %)."""
+        i, j = np.triu_indices(len(self.years), k=1)
+        n_units, n_pairs = len(self.store.units), len(i)
+        return pd.DataFrame({
+            timeseries.UNIT_COL: np.repeat(np.arange(n_units), n_pairs),
+            START_COL: np.tile(self.years[i], n_units),
+            END_COL: np.tile(self.years[j], n_units),
+            CAGR_COL: self.rates[:, i, j].ravel() * 100,
+        })
+
+    def projection(self, start_year, end_year, target_years=None):
+        """Projizierte Bevölkerung (Gebiete x Zieljahre) mit der CAGR des gewählten Zeitraums."""
+        i, j = self._pair(start_year, end_year)
+        if target_years is not None and tuple(target_years) != self.projection_years:
+            values = project(self.store.matrix(), self.years, self.rates, i, j, target_years)
+            return pd.DataFrame(values, index=self.store.units.index, columns=list(target_years))
+        values = self._projections.get((i, j))
+        if values is None:
+            values = project(self.store.matrix(), self.years, self.rates, i, j, self.projection_years)
+            self._projections[(i, j)] = values  # höchstens ein Eintrag je Paar
+        return pd.DataFrame(values, index=self.store.units.index, columns=list(self.projection_years))
@@ -0,0 +1,102 @@
+# fstreamlit/hierarchy.py
+"""Verwaltungshierarchie (Land -> Gouvernement -> Markaz/Kism/...) aus Zeilenfolge und Status, mit vorberechneten Summen."""
+import numpy as np
+import pandas as pd
+
+from fstreamlit.analysis import NAME_COL, NATIONAL_STATUS, STATUS_COL, TOTAL_ROW_NAME
+
+GOVERNORATE_STATUS = 'Governorate'
+LEVEL_NATIONAL, LEVEL_GOVERNORATE, LEVEL_LOCAL = 0, 1, 2
+LEVEL_NAMES = {LEVEL_NATIONAL: "National", LEVEL_GOVERNORATE: "Governorate", LEVEL_LOCAL: "Local unit"}
+
+
+class HierarchyIndex:
+    """
+    Ordnet jede Zeile ihrem Gouvernement zu: in der Quelle folgen die Unter-Einheiten (Markaz, Kism, ...)
+    direkt auf die Gouvernement-Zeile; die Landessumme ('Miṣr', Status 'Republic') ist die Wurzel.
+    Alle Summen und Anteile werden einmal beim Aufbau berechnet; Abfragen sind danach Nachschlagen.
+    """
+
+    def __init__(self, store):
+        units = store.units
+        n = len(units)
+        positions = np.arange(n)
+        names = units[NAME_COL].astype(str).to_numpy() if NAME_COL in units else np.full(n, "")
+        status = units[STATUS_COL].astype(str).to_numpy() if STATUS_COL in units else np.full(n, "")
+        is_national = (status == NATIONAL_STATUS) | (np.char.lower(names.astype(str)) == TOTAL_ROW_NAME)
+        is_governorate = (status == GOVERNORATE_STATUS) & ~is_national
+
+        # Letzte Gouvernement-Zeile an oder vor jeder Position (-1: keine)
+        last_governorate = np.maximum.accumulate(np.where(is_governorate, positions, -1)) if n else positions
+        national_position = positions[is_national][0] if is_national.any() else -1
+
+        self.years = store.years
+        self.level = np.select([is_national, is_governorate], [LEVEL_NATIONAL, LEVEL_GOVERNORATE], LEVEL_LOCAL)
+        self.governorate_position = np.where(is_national, -1, last_governorate)
+        self.parent = np.where(is_national, -1, np.where(is_governorate, national_position, last_governorate))
+
+        # Gouvernements kodieren: Position der Gouvernement-Zeile -> 0..G-1
+        governorate_rows = positions[is_governorate]
+        self.governorates = list(names[governorate_rows])
+        code_of_row = np.full(n, -1)
+        code_of_row[governorate_rows] = np.arange(len(governorate_rows))
+        self.governorate_code = np.where(self.governorate_position >= 0, code_of_row[self.governorate_position], -1)
+
+        matrix = store.matrix()
+        filled = np.nan_to_num(matrix)
+        year_labels = list(self.years)
+
+        # Gemeldete Gouvernementssummen und Summen der Unter-Einheiten je Jahr
+        self.governorate_totals = pd.DataFrame(matrix[governorate_rows], index=self.governorates, columns=year_labels)
+        local = (self.level == LEVEL_LOCAL) & (self.governorate_code >= 0)
+        child_sums = np.zeros((len(governorate_rows), len(year_labels)))
+        np.add.at(child_sums, self.governorate_code[local], filled[local])
+        self.children_totals = pd.DataFrame(child_sums, index=self.governorates, columns=year_labels)
+
+        # Summen je Ebene und je Status
+        self.level_totals = pd.DataFrame(filled, columns=year_labels).groupby(
+            pd.Series(self.level).map(LEVEL_NAMES).to_numpy()).sum()
+        self.status_totals = pd.DataFrame(filled, columns=year_labels).groupby(status).sum()
+
+        # Anteil am Elternknoten (Unter-Einheit -> Gouvernement, Gouvernement -> Land)
+        parent_values = np.where(self.parent[:, None] >= 0, matrix[np.maximum(self.parent, 0)], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(parent_values > 0, matrix / parent_values * 100, np.nan)
+        self.share_of_parent = pd.DataFrame(share, index=units.index, columns=year_labels)
+
+        # Mitglieder je Gouvernement (Positionen der Unter-Einheiten)
+        order = np.argsort(self.governorate_code, kind="stable")
+        bounds = np.searchsorted(self.governorate_code[order], np.arange(len(governorate_rows) + 1))
+        self._members = {
+            name: order[bounds[i]:bounds[i + 1]][self.level[order[bounds[i]:bounds[i + 1]]] == LEVEL_LOCAL]
+            for i, name in enumerate(self.governorates)
+        }
+        self._units = units
+        self._matrix = matrix
+
+    # --- Abfragen ---
+    def members(self, governorate):
+        """Zeilenpositionen der Unter-Einheiten eines Gouvernements."""
+        return self._members.get(governorate, np.empty(0, dtype=int))
+
+    def governorate_of(self, unit_id):
+        code = self.governorate_code[unit_id]
+        return self.governorates[code] if code >= 0 else None
+
+    def level_mask(self, level):
+        return self.level == level
+
+    def drill_down(self, governorate, year):
+        """Unter-Einheiten eines Gouvernements mit Bevölkerung und Anteil am Gouvernement im Jahr `year`."""
+        members = self.members(governorate)
+        year_position = int(np.flatnonzero(self.years == year)[0])
+        columns = [col for col in (NAME_COL, STATUS_COL) if col in self._units]
+        return self._units.iloc[members][columns].assign(**{
+            f"population_{year}": self._matrix[members, year_position],
+            "share_of_governorate": self.share_of_parent[year].to_numpy()[members],
+        })
+
+    def frame(self):
+        """Stammdaten mit Spalten 'governorate' und 'level' (für Filter und Drill-down)."""
+        governorate = np.array(self.governorates + [None], dtype=object)[self.governorate_code]
+        return self._units.assign(governorate=governorate, level=pd.Series(self.level).map(LEVEL_NAMES).to_numpy())
@@ -0,0 +1,122 @@
+# fstreamlit/loader.py
+"""Gestaffelter Datensatz-Lader: Snapshot -> gebündelte CSV -> GitHub -> Web-Scraping."""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from fstreamlit import dtypes, telemetry
+
+# --- Pfade ---
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUNDLED_CSV = os.path.join(APP_DIR, "cleaned_egypt_population_wide.csv")
+DATA_DIR = os.environ.get("FSTREAMLIT_DATA_DIR", os.path.join(APP_DIR, ".data"))
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "cleaned_egypt_population_wide.arrow")
+GITHUB_URL = "https://raw.githubusercontent.com/Mahmoud-Ezat/Fstreamlit/master/Desktop/Streamlit/cleaned_egypt_population_wide.csv"
+
+# Schlüssel für DataFrame.attrs (NaN-Füllwerte usw.) in den Arrow-Schema-Metadaten
+ATTRS_META_KEY = b"fstreamlit.attrs"
+
+
+def normalize_columns(df):
+    """Vereinheitlicht Spaltennamen (Kleinbuchstaben, Unterstriche, ohne Sonderzeichen)."""
+    df.columns = [re.sub(r"[^\w\s]", "", str(col)).strip().replace(" ", "_").lower() for col in df.columns]
+    return df
+
+
+def dataset_fingerprint(df):
+    """Inhalts-Hash des DataFrames (Spaltennamen + Werte), unabhängig vom Ladeweg."""
+    digest = hashlib.sha1("|".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def read_bundled_csv(path=BUNDLED_CSV):
+    """Liest die mit der App ausgelieferte, bereits bereinigte CSV-Datei."""
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+
+# --- Snapshot (Arrow IPC, memory-mapped) ---
+def read_snapshot(path=SNAPSHOT_PATH):
+    """Liest den Arrow-IPC-Snapshot per Memory-Mapping; gibt None zurück, wenn keiner existiert."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, "r") as source:
+            table = ipc.open_file(source).read_all()
+            df = table.to_pandas()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    meta = table.schema.metadata or {}
+    if ATTRS_META_KEY in meta:
+        df.attrs.update(json.loads(meta[ATTRS_META_KEY].decode("utf-8")))
+    return df
+
+
+def snapshot_age(path=SNAPSHOT_PATH):
+    """Alter des Snapshots in Sekunden (None, wenn keiner existiert)."""
+    try:
+        return max(time.time() - os.path.getmtime(path), 0.0)
+    except OSError:
+        return None
+
+
+def write_snapshot(df, path=SNAPSHOT_PATH):
+    """Schreibt den DataFrame atomar als Arrow-IPC-Datei (inkl. attrs)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[ATTRS_META_KEY] = json.dumps(df.attrs, default=float).encode("utf-8")
+    table = table.replace_schema_metadata(meta)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"  # Sitzungen und Hintergrund-Worker schreiben parallel
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+# --- Gestaffeltes Laden ---
+def load_tiered(tiers, snapshot_path=SNAPSHOT_PATH, use_snapshot=True):
+    """
+    Probiert zuerst den Snapshot, dann die übergebenen Stufen der Reihe nach.
+    `tiers` ist eine Liste von (Name, Funktion) - jede Funktion gibt ein DataFrame oder None zurück.
+    Jede erfolgreiche Stufe (außer dem Snapshot selbst) schreibt den Snapshot zurück.
+    Gibt (DataFrame, Name der Quelle) bzw. (None, None) zurück.
+    """
+    if use_snapshot:
+        with telemetry.span("load.snapshot"):
+            df = read_snapshot(snapshot_path)
+        if df is not None and not df.empty:
+            return df, "snapshot"
+
+    for name, load in tiers:
+        try:
+            with telemetry.span("load.tier", source=name):
+                df = load()
+        except Exception:
+            df = None
+        if df is None or df.empty:
+            continue
+        return prepare_loaded(df, snapshot_path), name
+
+    return None, None
+
+
+def prepare_loaded(df, snapshot_path=SNAPSHOT_PATH):
+    """Frisch geladene Daten vereinheitlichen (Spalten, dtypes) und als Snapshot zurückschreiben."""
+    with telemetry.span("load.optimize_dtypes", rows=len(df)):
+        df = dtypes.optimize_dtypes(normalize_columns(df))
+    try:
+        with telemetry.span("load.write_snapshot"):
+            write_snapshot(df, snapshot_path)
+    except (OSError, pa.ArrowException):
+        pass  # Snapshot ist nur ein Beschleuniger - Fehler beim Schreiben ignorieren
+    return df
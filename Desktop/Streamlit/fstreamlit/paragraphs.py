@@ -0,0 +1,37 @@
+# fstreamlit/paragraphs.py
+"""Absatztexte der Quellseite in einem Durchlauf über das (geteilte) lxml-Dokument, ohne erneutes Parsen."""
+import html
+import re
+
+# Text unter <p>, ohne Inhalte von <script>/<style>; das geteilte Dokument wird dabei nicht verändert
+PARAGRAPHS_XPATH = "//p[not(ancestor::script) and not(ancestor::style)]"
+TEXT_XPATH = ".//text()[not(ancestor::script) and not(ancestor::style)]"
+
+SEPARATOR = "\x00"  # trennt die Absätze für die gemeinsame Bereinigung
+ENTITY_RE = re.compile(r"&(?:amp;)*[a-zA-Z0-9#]+;")  # auch mehrfach kodierte wie '&amp;lt;'
+TAG_RE = re.compile(r"<[^>\x00]+>")  # nie über den Trenner hinweg - ein offenes '<' betrifft nur seinen Absatz
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def paragraph_texts(document):
+    """Rohtexte aller <p>-Elemente (Textknoten mit Leerzeichen verbunden, wie get_text(' ', strip=True))."""
+    return [
+        " ".join(part.strip() for part in p.xpath(TEXT_XPATH) if part.strip())
+        for p in document.xpath(PARAGRAPHS_XPATH)
+    ]
+
+
+def clean_paragraphs(texts):
+    """
+    Bereinigt alle Absätze auf einmal: Reste von Tags und (doppelt kodierte) Entitäten entfernen, danach
+    dekodieren - ein kodiertes '&lt;' im Text wird so nie zu Markup. Leerraum normalisieren; leere Absätze fallen weg.
+    """
+    joined = TAG_RE.sub("", SEPARATOR.join(texts))
+    joined = html.unescape(ENTITY_RE.sub(" ", joined))
+    cleaned = (WHITESPACE_RE.sub(" ", text).strip() for text in joined.split(SEPARATOR))
+    return [text for text in cleaned if text]
+
+
+def extract_paragraphs(document):
+    """Bereinigte Absatztexte eines mit fetch.parse_document(page, engine="lxml") geparsten Dokuments."""
+    return clean_paragraphs(paragraph_texts(document))
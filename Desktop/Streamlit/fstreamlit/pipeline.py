@@ -0,0 +1,75 @@
+# fstreamlit/pipeline.py
+"""Scraping-Pipeline ohne Streamlit: Abruf -> Extraktion -> DataFrame -> Bereinigung."""
+import pandas as pd
+import requests
+
+from fstreamlit import cleaning, extract, fetch, telemetry
+
+
+def _no_log(level, message):
+    pass
+
+
+def table_to_frame(table, log=_no_log):
+    """Baut aus den Spalten-Arrays ein DataFrame mit den (gültigen) Tabellenüberschriften."""
+    num_data_cols = len(table.columns)
+    valid_headers = [col for col in table.headers if col]
+    if len(valid_headers) >= num_data_cols:
+        table_columns = valid_headers[:num_data_cols]
+    else:
+        log("warning", f"Not enough valid headers ({len(valid_headers)}). Expected {num_data_cols}. Using generic names.")
+        table_columns = [f'Column_{i+1}' for i in range(num_data_cols)]
+    df = pd.DataFrame(dict(enumerate(table.columns)))
+    df.columns = table_columns
+    return df
+
+
+def scrape_and_clean(url=fetch.SOURCE_URL, log=_no_log):
+    """
+    Scrapt Bevölkerungsdaten von der angegebenen URL, bereinigt sie und gibt ein Pandas DataFrame zurück.
+    Fortschritt und Fehler gehen an `log(level, message)` (level: "info", "warning", "error", "write");
+    bei Fehlern wird None zurückgegeben.
+    """
+    log("info", f"Fetching data from {url}...")
+    try:
+        with telemetry.span("pipeline.fetch", url=url):
+            page = fetch.fetch_page(url)
+    except requests.exceptions.RequestException as e:
+        log("error", f"Error fetching URL: {e}")
+        return None
+
+    log("info", "Parsing HTML content...")
+    try:
+        with telemetry.span("pipeline.parse", revalidated=page.revalidated):
+            document = fetch.parse_document(page, engine="lxml")
+        with telemetry.span("pipeline.extract"):
+            table = extract.extract_table(document)
+    except extract.ExtractionError as e:
+        log("error", str(e))
+        return None
+    except Exception as e:
+        log("error", f"Error extracting table: {e}")
+        return None
+
+    if table.n_rows == 0:
+        log("warning", "No data rows extracted.")
+        return None
+
+    log("info", f"Extracted {table.n_rows} rows.")
+
+    log("info", "Creating DataFrame...")
+    try:
+        with telemetry.span("pipeline.to_frame", rows=table.n_rows):
+            egypt_data = table_to_frame(table, log)
+    except Exception as e:
+        log("error", f"Error creating DataFrame: {e}")
+        return None
+
+    log("info", "Cleaning data...")
+    with telemetry.span("pipeline.clean", rows=len(egypt_data)):
+        egypt_data, rows_dropped = cleaning.clean_table(egypt_data)
+    if rows_dropped > 0:
+        log("write", f"Dropped {rows_dropped} duplicate rows.")
+
+    log("info", "Data cleaning complete.")
+    return egypt_data
@@ -0,0 +1,110 @@
+# fstreamlit/prefetch.py
+"""Hintergrund-Aktualisierung (stale-while-revalidate): Sitzungen lesen den letzten guten Stand, ein Worker lädt neu."""
+import threading
+import time
+from collections import namedtuple
+
+from fstreamlit import build, loader, refresh, sources, telemetry
+
+REFRESH_INTERVAL = 3600  # Sekunden zwischen zwei Aktualisierungen (wie der Cache-TTL der App)
+
+# Veröffentlichter Stand: wird nur als Ganzes ersetzt, nie verändert
+Snapshot = namedtuple("Snapshot", ["df", "fingerprint", "source", "loaded_at"])
+
+
+def _no_log(level, message):
+    pass
+
+
+def network_tiers(log=_no_log):
+    """Netzwerkstufen in Startreihenfolge: zuerst GitHub, Web-Scraping nach der Hedge-Verzögerung."""
+    return build.source_tiers("github", log=log) + build.source_tiers("web", log=log)
+
+
+class Prefetcher:
+    """
+    Ein Worker-Thread je Prozess. `current()` liefert sofort den zuletzt veröffentlichten Stand;
+    `request_refresh()` weckt den Worker, der im Hintergrund lädt, den Snapshot schreibt und dann umschaltet.
+    Die Netzwerkquellen laufen über einen SourceCoordinator (Hedging, Backoff, Circuit Breaker je Quelle).
+    """
+
+    def __init__(self, tiers=None, snapshot_path=loader.SNAPSHOT_PATH, interval=REFRESH_INTERVAL, log=_no_log):
+        self.tiers = tiers if tiers is not None else network_tiers(log)
+        self.coordinator = sources.SourceCoordinator(self.tiers)
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self.log = log
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._current = None
+        self._status = {"state": "idle", "last_attempt": None, "last_success": None, "last_error": None, "last_refresh": None}
+
+        df = loader.read_snapshot(snapshot_path)
+        if df is not None and not df.empty:
+            self.publish(df, "snapshot", loaded_at=time.time() - (loader.snapshot_age(snapshot_path) or 0))
+
+    # --- Veröffentlichter Stand ---
+    def current(self):
+        return self._current
+
+    def publish(self, df, source, loaded_at=None):
+        """Schaltet atomar auf einen neuen Stand um (eine Referenzzuweisung); gibt den Snapshot zurück."""
+        snapshot = Snapshot(df, loader.dataset_fingerprint(df), source, loaded_at or time.time())
+        with self._lock:
+            self._current = snapshot
+        return snapshot
+
+    def status(self):
+        with self._lock:
+            return dict(self._status)
+
+    def _set_status(self, **changes):
+        with self._lock:
+            self._status.update(changes)
+
+    # --- Worker ---
+    def start(self):
+        """Startet den Worker einmalig; ist der Stand älter als das Intervall (oder fehlt), wird sofort geladen."""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._thread = threading.Thread(target=self._run, name="fstreamlit-prefetch", daemon=True)
+        current = self.current()
+        if current is None or time.time() - current.loaded_at >= self.interval:
+            self._wake.set()
+        self._thread.start()
+        return self
+
+    def request_refresh(self):
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(timeout=self.interval)
+            self._wake.clear()
+            self.refresh_now()
+
+    def refresh_now(self):
+        """Eine Aktualisierung: Netzwerkstufen laden, Snapshot + Artefakte schreiben, dann umschalten."""
+        self._set_status(state="refreshing", last_attempt=time.time())
+        try:
+            with telemetry.span("prefetch.refresh"):
+                df, source = self.coordinator.load()
+                if df is None:
+                    raise RuntimeError("All sources failed or are paused; keeping the last good snapshot.")
+                df = loader.prepare_loaded(df, self.snapshot_path)
+                update = refresh.refresh(df, source)
+        except Exception as e:
+            self.log("error", f"Background refresh failed: {e}")
+            self._set_status(state="idle", last_error=f"{type(e).__name__}: {e}")
+            return None
+        snapshot = self.publish(df, source)
+        self._set_status(state="idle", last_success=snapshot.loaded_at, last_error=None, last_refresh={
+            "version": update.manifest["version"],
+            "changes": refresh.summarize(update.diff) if update.diff is not None else None,
+            "recomputed": update.recomputed,
+            "reused": update.reused,
+        })
+        self.log("info", f"Background refresh published {len(df)} rows from {source}.")
+        return snapshot
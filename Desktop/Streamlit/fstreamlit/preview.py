@@ -0,0 +1,27 @@
+# fstreamlit/preview.py
+"""Seitenweise Datenvorschau: Sortierreihenfolge einmal berechnen, dann nur die sichtbare Seite als Arrow-Tabelle."""
+import math
+
+import numpy as np
+import pyarrow as pa
+
+PAGE_SIZES = (25, 50, 100, 500)
+
+
+def sort_order(df, column=None, ascending=True):
+    """Zeilenpositionen in Sortierreihenfolge (stabil, fehlende Werte zuletzt); None = Quellreihenfolge."""
+    if column is None:
+        return np.arange(len(df))
+    values = df[column].reset_index(drop=True)
+    return values.sort_values(ascending=ascending, na_position='last', kind='stable').index.to_numpy()
+
+
+def page_count(n_rows, page_size):
+    return max(math.ceil(n_rows / page_size), 1)
+
+
+def page_table(df, order, page, page_size, columns):
+    """Seite `page` (ab 1) der Spalten `columns` als pyarrow.Table - Kosten ~ Seitengröße, nicht Tabellengröße."""
+    start = (page - 1) * page_size
+    positions = order[start:start + page_size]
+    return pa.Table.from_pandas(df.iloc[positions][list(columns)], preserve_index=False)
@@ -0,0 +1,73 @@
+# fstreamlit/ranking.py
+"""Top-k/Bottom-k per Teilauswahl (np.partition) über beliebige Spalten oder abgeleitete Kennzahlen."""
+import numpy as np
+import pandas as pd
+
+
+def metric_values(df, metric):
+    """Kennzahl als float-Array: Spaltenname (z. B. 'population_2023') oder Funktion df -> Werte."""
+    values = df[metric] if isinstance(metric, str) else metric(df)
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def _sorted_positions(values, positions, descending):
+    """Sortiert Positionen nach Wert; bei Gleichstand gewinnt die frühere Zeile (wie nlargest)."""
+    keys = -values[positions] if descending else values[positions]
+    return positions[np.lexsort((positions, keys))]
+
+
+def extreme_positions(values, k, na_position='last'):
+    """
+    Gibt (Top-k, Bottom-k) als Zeilenpositionen zurück - beide Grenzwerte aus einem np.partition-Aufruf.
+    NaN werden nie gerankt; mit na_position='last' füllen sie (in Zeilenreihenfolge) auf k auf,
+    wie sort_values(..., na_position='last').head(k); mit None werden sie verworfen.
+    """
+    nan_mask = np.isnan(values)
+    valid = np.flatnonzero(~nan_mask)
+    n = len(valid)
+    if 0 < k and n > 2 * k:
+        # Grenzwerte per Teilauswahl; alle Zeilen mit genau diesem Wert bleiben Kandidaten, damit der
+        # stabile Gleichstand-Vergleich unten (frühere Zeile zuerst) über alle Gleichstände entscheidet
+        valid_values = values[valid]
+        bounds = np.partition(valid_values, (k - 1, n - k))
+        bottom_candidates = valid[valid_values <= bounds[k - 1]]
+        top_candidates = valid[valid_values >= bounds[n - k]]
+    else:
+        bottom_candidates = top_candidates = valid
+    top = _sorted_positions(values, top_candidates, descending=True)[:k]
+    bottom = _sorted_positions(values, bottom_candidates, descending=False)[:k]
+    if na_position == 'last':
+        nan_positions = np.flatnonzero(nan_mask)
+        top = np.concatenate([top, nan_positions[:k - len(top)]])
+        bottom = np.concatenate([bottom, nan_positions[:k - len(bottom)]])
+    return top.astype(np.intp), bottom.astype(np.intp)
+
+
+def rank_extremes(df, metric, k=10, na_position='last'):
+    """Gibt (Top-k, Bottom-k) als Teil-DataFrames von df zurück."""
+    top, bottom = extreme_positions(metric_values(df, metric), k, na_position)
+    return df.iloc[top], df.iloc[bottom]
+
+
+def top_k(df, metric, k=10, na_position=None):
+    """Die k größten Werte (Ersatz für df.nlargest(k, metric), auch für abgeleitete Kennzahlen)."""
+    return rank_extremes(df, metric, k, na_position)[0]
+
+
+def bottom_k(df, metric, k=10, na_position=None):
+    """Die k kleinsten Werte (Ersatz für df.nsmallest(k, metric))."""
+    return rank_extremes(df, metric, k, na_position)[1]
+
+
+def grouped_extremes(df, metric, by='status', k=10, na_position=None):
+    """Top-k/Bottom-k je Gruppe (z. B. je Status): {Gruppe: (Top-k, Bottom-k)}."""
+    values = metric_values(df, metric)
+    codes, groups = pd.factorize(df[by], sort=True)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(groups) + 1))
+    result = {}
+    for i, group in enumerate(groups):
+        positions = order[bounds[i]:bounds[i + 1]]
+        top, bottom = extreme_positions(values[positions], k, na_position)
+        result[group] = (df.iloc[positions[top]], df.iloc[positions[bottom]])
+    return result
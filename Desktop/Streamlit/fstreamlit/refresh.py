@@ -0,0 +1,169 @@
+# fstreamlit/refresh.py
+"""Inkrementelles Neuladen: Diff gegen die letzte Version, nur betroffene Ergebnisse neu berechnen, Rollback."""
+import os
+import shutil
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from fstreamlit import analysis, artifacts, loader, telemetry
+
+KEEP_VERSIONS = 5
+
+# Zeilen werden über (Name, Status, n-tes Vorkommen) identifiziert - Namen allein sind nicht eindeutig
+FrameDiff = namedtuple("FrameDiff", [
+    "added_rows", "removed_rows", "changed_rows",
+    "added_columns", "removed_columns", "changed_columns",
+    "total_changed",
+])
+Refresh = namedtuple("Refresh", ["manifest", "diff", "recomputed", "reused"])
+
+
+# --- Diff ---
+def row_keys(df):
+    """Stabile Zeilenschlüssel (name, status, Vorkommen) als MultiIndex."""
+    name = df[analysis.NAME_COL].astype(str) if analysis.NAME_COL in df.columns else pd.Series(df.index.astype(str), index=df.index)
+    status = df[analysis.STATUS_COL].astype(str) if analysis.STATUS_COL in df.columns else pd.Series("", index=df.index)
+    occurrence = df.groupby([name, status], sort=False).cumcount()
+    return pd.MultiIndex.from_arrays([name, status, occurrence], names=["name", "status", "occurrence"])
+
+
+def _equal(a, b):
+    """Elementweiser Vergleich zweier Spalten (NaN == NaN), unabhängig vom konkreten dtype."""
+    if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+        a = a.to_numpy(dtype=float, na_value=np.nan)
+        b = b.to_numpy(dtype=float, na_value=np.nan)
+        return (a == b) | (np.isnan(a) & np.isnan(b))
+    a, b = a.astype("string"), b.astype("string")
+    return (a.eq(b).fillna(False) | (a.isna() & b.isna())).to_numpy(dtype=bool)
+
+
+def diff_frames(old, new):
+    """Zeilen-/Spaltendiff zwischen zwei bereinigten Tabellen; die Gesamtzeile wird getrennt verglichen."""
+    old_areas, old_total = analysis.split_total_row(old)
+    new_areas, new_total = analysis.split_total_row(new)
+    common_columns = [col for col in new.columns if col in old.columns]
+
+    old_keyed = old_areas.set_axis(row_keys(old_areas))
+    new_keyed = new_areas.set_axis(row_keys(new_areas))
+    common = new_keyed.index.intersection(old_keyed.index, sort=False)
+    old_common = old_keyed.loc[common, common_columns]
+    new_common = new_keyed.loc[common, common_columns]
+
+    changed_mask = np.zeros(len(common), dtype=bool)
+    changed_columns = []
+    for col in common_columns:
+        equal = _equal(old_common[col], new_common[col])
+        if not equal.all():
+            changed_columns.append(col)
+            changed_mask |= ~equal
+
+    # Gesamtzeile: None = hinzugekommen/weggefallen, sonst Liste geänderter Spalten
+    if (old_total is None) != (new_total is None):
+        total_changed = None
+    elif new_total is None:
+        total_changed = []
+    else:
+        # Gesamtzeile ist eine float-Serie über die Bevölkerungsspalten
+        common_total = [col for col in new_total.index if col in old_total.index]
+        equal = _equal(old_total[common_total], new_total[common_total])
+        total_changed = [col for col, same in zip(common_total, equal) if not same]
+        total_changed += [col for col in new_total.index.symmetric_difference(old_total.index) if col not in total_changed]
+
+    return FrameDiff(
+        added_rows=new_keyed.index.difference(old_keyed.index, sort=False),
+        removed_rows=old_keyed.index.difference(new_keyed.index, sort=False),
+        changed_rows=common[changed_mask],
+        added_columns=[col for col in new.columns if col not in old.columns],
+        removed_columns=[col for col in old.columns if col not in new.columns],
+        changed_columns=changed_columns,
+        total_changed=total_changed,
+    )
+
+
+def summarize(diff):
+    """Kurzfassung eines Diffs für Anzeige und Log."""
+    return {
+        "rows_added": len(diff.added_rows),
+        "rows_removed": len(diff.removed_rows),
+        "rows_changed": len(diff.changed_rows),
+        "columns_added": diff.added_columns,
+        "columns_removed": diff.removed_columns,
+        "columns_changed": diff.changed_columns,
+        "total_row_changed": diff.total_changed is None or bool(diff.total_changed),
+    }
+
+
+# --- Betroffene Ergebnisgruppen ---
+def _group_inputs(inputs, columns):
+    if inputs is None:
+        return set(columns)
+    if inputs == "population":
+        return set(analysis.population_columns(pd.DataFrame(columns=list(columns))))
+    return set(inputs)
+
+
+def affected_groups(diff, columns):
+    """Namen der Ergebnisgruppen aus analysis.RESULT_GROUPS, deren Eingaben sich geändert haben."""
+    structural = set(diff.added_columns) | set(diff.removed_columns)
+    rows_moved = len(diff.added_rows) > 0 or len(diff.removed_rows) > 0
+    affected = []
+    for name, _, scope, inputs in analysis.RESULT_GROUPS:
+        inputs = _group_inputs(inputs, set(columns) | structural)
+        if scope == "total":
+            changed = diff.total_changed is None or bool(inputs & set(diff.total_changed))
+        else:
+            changed = rows_moved or bool(inputs & set(diff.changed_columns))
+        if changed or inputs & structural:
+            affected.append(name)
+    return affected
+
+
+# --- Versionen ---
+def refresh(df, source, out_dir=artifacts.ARTIFACTS_DIR, keep=KEEP_VERSIONS):
+    """Schreibt df als neue Version; berechnet nur die vom Diff zur letzten Version betroffenen Ergebnisse neu."""
+    all_groups = [name for name, _, _, _ in analysis.RESULT_GROUPS]
+    previous = artifacts.read_manifest(out_dir=out_dir)
+    if previous is not None and previous["fingerprint"] == loader.dataset_fingerprint(df):
+        return Refresh(previous, None, [], all_groups)
+
+    old = artifacts.read_artifacts(previous, out_dir) if previous is not None else None
+    if old is None or old["cleaned_df"] is None:
+        diff, recompute, results = None, all_groups, {}
+    else:
+        with telemetry.span("refresh.diff", rows=len(df)):
+            diff = diff_frames(old["cleaned_df"], df)
+        recompute = affected_groups(diff, df.columns)
+        results = {key: value for key, value in old.items() if key != "cleaned_df"}
+
+    for name, compute, _, _ in analysis.RESULT_GROUPS:
+        if name in recompute:
+            with telemetry.span(f"analysis.{name}", rows=len(df)):
+                results.update(compute(df))
+
+    manifest = artifacts.write_artifacts(df, results, source, out_dir=out_dir)
+    prune_versions(out_dir, keep)
+    return Refresh(manifest, diff, recompute, [name for name in all_groups if name not in recompute])
+
+
+def prune_versions(out_dir=artifacts.ARTIFACTS_DIR, keep=KEEP_VERSIONS):
+    """Löscht alle bis auf die neuesten `keep` Versionen; die aktuelle (LATEST) bleibt immer erhalten."""
+    latest = artifacts.read_manifest(out_dir=out_dir)
+    latest_version = latest["version"] if latest is not None else None
+    for manifest in artifacts.list_versions(out_dir)[keep:]:
+        if manifest["version"] != latest_version:
+            shutil.rmtree(os.path.join(out_dir, manifest["version"]), ignore_errors=True)
+
+
+def rollback(version, out_dir=artifacts.ARTIFACTS_DIR, snapshot_path=loader.SNAPSHOT_PATH):
+    """Setzt LATEST auf eine ältere Version zurück und übernimmt deren Tabelle als Snapshot; gibt sie zurück."""
+    manifest = artifacts.read_manifest(version, out_dir)
+    if manifest is None:
+        raise ValueError(f"Unknown artifacts version: {version}")
+    results = artifacts.read_artifacts(manifest, out_dir)
+    if results is None or results["cleaned_df"] is None:
+        raise ValueError(f"Artifacts version {version} has no cleaned table")
+    artifacts.set_latest(version, out_dir)
+    loader.write_snapshot(results["cleaned_df"], snapshot_path)
+    return results["cleaned_df"]
@@ -0,0 +1,79 @@
+# fstreamlit/search.py
+"""Trigramm-Suchindex über lateinische (name) und arabische (native) Namen mit Normalisierung."""
+import re
+import unicodedata
+
+import numpy as np
+
+from fstreamlit.analysis import NAME_COL, NATIVE_COL
+
+# --- Normalisierung ---
+ARABIC_DIACRITICS_RE = re.compile(r"[\u064B-\u0652\u0670\u0640]")  # Tashkeel, Superscript Alef, Tatweel
+ARABIC_LETTERS = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه",
+})
+PUNCTUATION_RE = re.compile(r"[^\w\s]|_")
+WHITESPACE_RE = re.compile(r"\s+")
+
+PAD = "  "  # Wortanfang markieren, damit kurze Präfixe ("a", "aj") eigene Trigramme haben
+MAX_CANDIDATES = 500
+
+
+def normalize(text):
+    """Kleinschreibung, ohne lateinische Diakritika (ā -> a, ṣ -> s) und arabische Vokalzeichen, vereinheitlichte Alef/Ya/Ta-Marbuta."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = ARABIC_DIACRITICS_RE.sub("", text).translate(ARABIC_LETTERS).lower()
+    text = PUNCTUATION_RE.sub(" ", text)
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def trigrams(normalized, query=False):
+    """Trigramme je Wort; Wörter sind vorne mit zwei Leerzeichen gepolstert (Anfragen hinten nicht)."""
+    grams = set()
+    for word in normalized.split(" "):
+        if not word:
+            continue
+        padded = PAD + word + ("" if query else " ")
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """Invertierter Trigramm-Index: Trigramm -> sortiertes Array der Zeilenpositionen."""
+
+    def __init__(self, df, fields=(NAME_COL, NATIVE_COL)):
+        fields = [f for f in fields if f in df.columns]
+        self._fields = [[normalize(v) if v == v and v is not None else "" for v in df[f].tolist()] for f in fields]
+        self._n = len(df)
+        postings = {}
+        for field_values in self._fields:
+            for position, value in enumerate(field_values):
+                for gram in trigrams(value):
+                    postings.setdefault(gram, []).append(position)
+        self._postings = {gram: np.unique(np.asarray(ids, dtype=np.int32)) for gram, ids in postings.items()}
+
+    def search(self, query, limit=20):
+        """
+        Gibt (Positionen, Scores) der besten Treffer zurück. Score = Anteil der Anfrage-Trigramme im Namen
+        (0..1) + 1 für einen Wortanfang-Treffer bzw. + 0.5 für einen Teilstring-Treffer in einem der Felder.
+        """
+        normalized = normalize(query)
+        grams = trigrams(normalized, query=True)
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not grams or not lists:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        counts = np.bincount(np.concatenate(lists), minlength=self._n)
+        candidates = np.flatnonzero(counts)
+        if len(candidates) > MAX_CANDIDATES:
+            candidates = candidates[np.argpartition(-counts[candidates], MAX_CANDIDATES - 1)[:MAX_CANDIDATES]]
+        scores = counts[candidates] / len(grams)
+        for i, position in enumerate(candidates):
+            values = [field[position] for field in self._fields]
+            if any((" " + v).find(" " + normalized) >= 0 for v in values):
+                scores[i] += 1.0
+            elif any(normalized in v for v in values):
+                scores[i] += 0.5
+        order = np.lexsort((candidates, -scores))[:limit]
+        return candidates[order], scores[order]
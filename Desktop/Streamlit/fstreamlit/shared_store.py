@@ -0,0 +1,144 @@
+# fstreamlit/shared_store.py
+"""Prozessweiter Speicher für Datensätze und abgeleitete Objekte: globales Speicherbudget, LRU, Metriken je Sitzung."""
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from fstreamlit import telemetry
+
+DEFAULT_BUDGET_BYTES = int(float(os.environ.get("FSTREAMLIT_CACHE_BUDGET_MB", "256")) * 1024**2)
+MAX_DATASET_VERSIONS = 4
+SESSION_IDLE_SECONDS = 3600  # Sitzungen ohne Zugriff gelten danach als beendet
+
+
+class SharedStore:
+    """
+    Eine unveränderliche Tabelle je Datensatzversion (Fingerprint) plus abgeleitete Objekte unter einem Budget.
+    Alle Werte werden von allen Sitzungen geteilt und dürfen nicht verändert werden.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._datasets = OrderedDict()  # fingerprint -> (df, bytes)
+        self._entries = OrderedDict()   # key -> (value, bytes); älteste zuerst
+        self._pending = {}              # key -> Event, solange eine Sitzung den Wert berechnet
+        self._sessions = {}             # session_id -> {"keys": set, "dataset": fingerprint, "last_seen": t}
+        self._hits = Counter()
+        self._misses = Counter()
+        self._evictions = Counter()
+        self.used_bytes = 0
+
+    # --- Datensätze ---
+    def dataset(self, fingerprint, df, session_id=None):
+        """Gibt die geteilte Tabelle der Version zurück; die übergebene wird nur beim ersten Mal übernommen."""
+        with self._lock:
+            if fingerprint not in self._datasets:
+                self._datasets[fingerprint] = (df, telemetry.object_size(df))
+                while len(self._datasets) > MAX_DATASET_VERSIONS:
+                    self._datasets.popitem(last=False)
+            self._datasets.move_to_end(fingerprint)
+            if session_id is not None:
+                self._session(session_id)["dataset"] = fingerprint
+            return self._datasets[fingerprint][0]
+
+    # --- Abgeleitete Objekte ---
+    def get_or_compute(self, key, compute, session_id=None):
+        """
+        Wert zu `key` (Tupel, erstes Element = Name für die Metriken) oder compute() bei einem Miss.
+        Gleichzeitige Anfragen derselben Sitzung oder anderer Sitzungen berechnen denselben Wert nur einmal.
+        """
+        name = key[0]
+        while True:
+            with self._lock:
+                if session_id is not None:
+                    self._session(session_id)["keys"].add(key)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self._hits[name] += 1
+                    return self._entries[key][0]
+                event = self._pending.get(key)
+                if event is None:
+                    self._pending[key] = threading.Event()
+                    self._misses[name] += 1
+                    break
+            event.wait()  # eine andere Sitzung berechnet gerade - danach erneut nachsehen
+
+        try:
+            value = compute()
+            self._insert(key, value, telemetry.object_size(value))
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key).set()
+
+    def _insert(self, key, value, size):
+        with self._lock:
+            if size > self.budget_bytes:
+                return  # größer als das ganze Budget: nur an den Aufrufer zurückgeben
+            self._entries[key] = (value, size)
+            self.used_bytes += size
+            while self.used_bytes > self.budget_bytes:
+                old_key, (_, old_size) = self._entries.popitem(last=False)
+                self.used_bytes -= old_size
+                self._evictions[old_key[0]] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._datasets.clear()
+            self.used_bytes = 0
+
+    # --- Metriken ---
+    def _session(self, session_id):
+        session = self._sessions.setdefault(session_id, {"keys": set(), "dataset": None, "last_seen": 0.0})
+        session["last_seen"] = time.time()
+        return session
+
+    def stats(self):
+        """{Name: {"hits", "misses", "evictions", "entries", "bytes"}} über alle Sitzungen."""
+        with self._lock:
+            names = set(self._hits) | set(self._misses)
+            entries, sizes = Counter(), Counter()
+            for key, (_, size) in self._entries.items():
+                entries[key[0]] += 1
+                sizes[key[0]] += size
+            return {
+                name: {
+                    "hits": self._hits[name], "misses": self._misses[name], "evictions": self._evictions[name],
+                    "entries": entries[name], "bytes": sizes[name],
+                }
+                for name in sorted(names)
+            }
+
+    def summary(self):
+        with self._lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "derived_bytes": self.used_bytes,
+                "derived_entries": len(self._entries),
+                "dataset_versions": len(self._datasets),
+                "dataset_bytes": sum(size for _, size in self._datasets.values()),
+            }
+
+    def session_usage(self, idle_seconds=SESSION_IDLE_SECONDS):
+        """Je aktiver Sitzung: referenzierte Datensatzversion und Bytes der (noch gespeicherten) genutzten Objekte."""
+        now = time.time()
+        with self._lock:
+            for session_id in [s for s, info in self._sessions.items() if now - info["last_seen"] > idle_seconds]:
+                del self._sessions[session_id]
+            usage = []
+            for session_id, info in self._sessions.items():
+                live = [key for key in info["keys"] if key in self._entries]
+                info["keys"] = set(live)  # verdrängte Einträge vergessen
+                dataset = self._datasets.get(info["dataset"])
+                usage.append({
+                    "session": session_id,
+                    "dataset_version": (info["dataset"] or "")[:12],
+                    "dataset_bytes": dataset[1] if dataset is not None else 0,
+                    "derived_entries": len(live),
+                    "derived_bytes": sum(self._entries[key][1] for key in live),
+                    "idle_seconds": now - info["last_seen"],
+                })
+            return usage
@@ -0,0 +1,151 @@
+# fstreamlit/sources.py
+"""Quellen parallel statt nacheinander: gestaffelter Start (Hedging), Wiederholung mit Backoff, Circuit Breaker je Quelle."""
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from fstreamlit import telemetry
+
+HEDGE_DELAY = 2.0       # Sekunden, bis die nächste Quelle zusätzlich gestartet wird
+RETRIES = 3             # Versuche je Quelle und Ladevorgang
+BACKOFF_BASE = 0.5      # Wartezeit vor dem 2. Versuch, danach jeweils verdoppelt
+BACKOFF_MAX = 8.0
+FAILURE_THRESHOLD = 3   # fehlgeschlagene Ladevorgänge in Folge, bis der Breaker öffnet
+RESET_TIMEOUT = 6 * 3600  # so lange wird eine offene Quelle übersprungen, dann ein Probeversuch
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitBreaker:
+    """Überspringt eine wiederholt fehlschlagende Quelle bis `reset_timeout` abgelaufen ist (dann ein Probeversuch)."""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._probing = False  # halb offen: ein Probeversuch läuft, alle anderen werden abgewiesen
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return CLOSED
+        return HALF_OPEN if self._clock() - self.opened_at >= self.reset_timeout else OPEN
+
+    def allow(self):
+        """Geschlossen: immer; offen: nie; halb offen: genau ein Aufrufer, bis dessen Ergebnis gemeldet ist."""
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return True
+            if state == OPEN or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.last_error = None
+            self._probing = False
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            # Halb offen: ein Fehlschlag öffnet sofort wieder
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = self._clock()
+            self._probing = False
+
+    def snapshot(self):
+        with self._lock:
+            remaining = None
+            if self.opened_at is not None:
+                remaining = max(self.reset_timeout - (self._clock() - self.opened_at), 0.0)
+            return {"state": self.state, "failures": self.failures, "retry_in_seconds": remaining, "last_error": self.last_error}
+
+
+def backoff_delays(retries=RETRIES, base=BACKOFF_BASE, maximum=BACKOFF_MAX):
+    """Wartezeiten zwischen den Versuchen: base, 2*base, 4*base, ... (mit Jitter, gedeckelt)."""
+    return [min(base * 2 ** attempt, maximum) * random.uniform(0.5, 1.0) for attempt in range(retries - 1)]
+
+
+class SourceCoordinator:
+    """
+    Lädt aus mehreren Quellen (Liste von (Name, Funktion) wie bei loader.load_tiered): die erste startet sofort,
+    jede weitere nach `hedge_delay` oder sobald eine laufende Quelle endgültig scheitert. Das erste gültige
+    DataFrame gewinnt; Quellen mit offenem Breaker werden übersprungen.
+    """
+
+    def __init__(self, tiers, hedge_delay=HEDGE_DELAY, retries=RETRIES, backoff_base=BACKOFF_BASE, breakers=None):
+        self.tiers = list(tiers)
+        self.hedge_delay = hedge_delay
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.breakers = breakers if breakers is not None else {name: CircuitBreaker() for name, _ in self.tiers}
+
+    def _attempt(self, name, load):
+        """Eine Quelle mit Wiederholungen; gibt ein DataFrame oder None zurück (wirft nie)."""
+        error = "no data"
+        delays = backoff_delays(self.retries, self.backoff_base)
+        for attempt in range(self.retries):
+            try:
+                with telemetry.span("source.attempt", source=name, attempt=attempt + 1):
+                    df = load()
+                if df is not None and not df.empty:
+                    self.breakers[name].record_success()
+                    return df
+                error = "no data"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            if attempt < len(delays):
+                time.sleep(delays[attempt])
+        self.breakers[name].record_failure(error)
+        return None
+
+    def load(self):
+        """Gibt (DataFrame, Name der Quelle) der ersten erfolgreichen Quelle bzw. (None, None) zurück."""
+        tiers = list(self.tiers)
+        pool = ThreadPoolExecutor(max_workers=max(len(tiers), 1), thread_name_prefix="fstreamlit-source")
+        pending = {}
+        remaining = iter(tiers)
+
+        def launch_next():
+            """Startet die nächste Quelle, deren Breaker sie zulässt; False, wenn keine mehr übrig ist."""
+            # Erst beim Start fragen: ein halb offener Breaker vergibt seinen einzigen Probeversuch nur an eine Quelle,
+            # die auch wirklich läuft
+            for name, load in remaining:
+                if self.breakers[name].allow():
+                    pending[pool.submit(self._attempt, name, load)] = name
+                    return True
+            return False
+
+        try:
+            with telemetry.span("source.race", sources=len(tiers)):
+                more = launch_next()
+                while pending:
+                    done, _ = wait(pending, timeout=self.hedge_delay if more else None, return_when=FIRST_COMPLETED)
+                    if not done:
+                        more = launch_next()  # noch kein Ergebnis: nächste Quelle zusätzlich starten
+                        continue
+                    for future in done:
+                        name = pending.pop(future)
+                        df = future.result()
+                        if df is not None:
+                            return df, name
+                    if more:
+                        more = launch_next()  # gescheitert: nicht auf die Hedge-Verzögerung warten
+            return None, None
+        finally:
+            # Verlierer laufen im Hintergrund zu Ende (und aktualisieren ihren Breaker), blockieren aber nicht
+            pool.shutdown(wait=False)
+
+    def status(self):
+        """{Quelle: Breaker-Zustand} für die Diagnoseseite."""
+        return {name: self.breakers[name].snapshot() for name, _ in self.tiers}
@@ -0,0 +1,120 @@
+# fstreamlit/telemetry.py
+"""Zeitmessung je Pipeline-/Analyse-Stufe: Spans im Ringpuffer, optional als JSON-Lines exportiert."""
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+RING_SIZE = 1000
+# Optionaler Export: jeder Span wird als eine JSON-Zeile an diese Datei angehängt (für die Log-Pipeline)
+EXPORT_PATH = os.environ.get("FSTREAMLIT_TELEMETRY_LOG")
+
+_spans = deque(maxlen=RING_SIZE)
+_lock = threading.Lock()
+
+
+def record(entry, export_path=EXPORT_PATH):
+    """Legt einen fertigen Span im Ringpuffer ab und hängt ihn ggf. an die Exportdatei an."""
+    with _lock:
+        _spans.append(entry)
+        if export_path:
+            try:
+                with open(export_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, default=str, ensure_ascii=False) + "\n")
+            except OSError:
+                pass  # Export ist optional - die App darf daran nicht scheitern
+
+
+@contextmanager
+def span(name, **meta):
+    """Misst den umschlossenen Block; Ausnahmen werden als status="error" erfasst und weitergereicht."""
+    started_at = time.time()
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException as e:
+        status = f"error: {type(e).__name__}"
+        raise
+    finally:
+        record({
+            "name": name,
+            "started_at": started_at,
+            "seconds": time.perf_counter() - start,
+            "status": status,
+            "thread": threading.current_thread().name,
+            **meta,
+        })
+
+
+def recent(limit=None):
+    """Die letzten Spans (neueste zuerst)."""
+    with _lock:
+        entries = list(_spans)
+    entries.reverse()
+    return entries[:limit] if limit else entries
+
+
+def clear():
+    with _lock:
+        _spans.clear()
+
+
+def stage_summary():
+    """Kennzahlen je Stufe (Anzahl, Mittel, p50, p95, Maximum, letzter Lauf in ms) als DataFrame."""
+    entries = recent()
+    if not entries:
+        return None
+    frame = pd.DataFrame(entries)
+    grouped = frame.groupby("name")["seconds"]
+    summary = pd.DataFrame({
+        "count": grouped.size(),
+        "mean_ms": grouped.mean() * 1000,
+        "p50_ms": grouped.median() * 1000,
+        "p95_ms": grouped.quantile(0.95) * 1000,
+        "max_ms": grouped.max() * 1000,
+        "last_ms": frame.groupby("name").first()["seconds"] * 1000,
+        "errors": frame.assign(error=frame["status"] != "ok").groupby("name")["error"].sum(),
+    })
+    return summary.sort_values("mean_ms", ascending=False)
+
+
+def to_jsonl(entries=None):
+    """Spans als JSON-Lines-Text (älteste zuerst), z. B. für einen Download."""
+    entries = list(reversed(recent())) if entries is None else entries
+    return "".join(json.dumps(entry, default=str, ensure_ascii=False) + "\n" for entry in entries)
+
+
+# --- Speicherbedarf ---
+def object_size(obj, _seen=None):
+    """Geschätzter Speicher eines Objekts in Bytes (DataFrames/Serien tief, Container rekursiv)."""
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if hasattr(obj, "nbytes") and not isinstance(obj, type):
+        return int(obj.nbytes)  # numpy-Arrays, Arrow-Tabellen
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(object_size(k, _seen) + object_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(object_size(v, _seen) for v in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += object_size(vars(obj), _seen)  # eigene Klassen (Indizes, Speicher)
+    return size
+
+
+def session_memory(state):
+    """Speicher je Eintrag eines Sitzungszustands (Mapping) in Bytes, größte zuerst."""
+    seen = set()
+    usage = {str(key): object_size(value, seen) for key, value in state.items()}
+    return dict(sorted(usage.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,112 @@
+# fstreamlit/timeseries.py
+"""Kanonisches Langformat der Bevölkerungsdaten: sortierter (unit_id, year)-Index mit schnellen Breit-Ansichten."""
+import re
+
+import numpy as np
+import pandas as pd
+
+POP_COL_RE = re.compile(r"^population_(\d{4})$")
+UNIT_COL = 'unit_id'
+YEAR_COL = 'year'
+VALUE_COL = 'population'
+
+
+def year_columns(columns):
+    """{Jahr: Spaltenname} der population_<Jahr>-Spalten, nach Jahr sortiert - einzige Stelle, die Namen parst."""
+    found = {}
+    for col in columns:
+        match = POP_COL_RE.match(str(col))
+        if match:
+            found[int(match.group(1))] = col
+    return dict(sorted(found.items()))
+
+
+def population_column(year):
+    return f'population_{year}'
+
+
+class PopulationStore:
+    """
+    Bevölkerung je Gebiet und Jahr. `units` enthält die Stammdaten (name, status, ...) mit
+    unit_id = Zeilenposition im Breitformat; `series` ist die Langform mit sortiertem (unit_id, year)-Index.
+    """
+
+    def __init__(self, units, years, matrix):
+        self.units = units
+        self.years = np.asarray(years, dtype=int)
+        self._matrix = matrix  # float64, Form (Anzahl Gebiete, Anzahl Jahre)
+        index = pd.MultiIndex.from_arrays(
+            [np.repeat(np.arange(len(units)), len(self.years)), np.tile(self.years, len(units))],
+            names=[UNIT_COL, YEAR_COL],
+        )
+        self.series = pd.Series(matrix.ravel(), index=index, name=VALUE_COL)
+
+    @classmethod
+    def from_wide(cls, df):
+        columns = year_columns(df.columns)
+        matrix = np.column_stack([
+            df[col].to_numpy(dtype=float, na_value=np.nan) for col in columns.values()
+        ]) if columns else np.empty((len(df), 0))
+        units = df.drop(columns=list(columns.values())).reset_index(drop=True)
+        units.index.name = UNIT_COL
+        return cls(units, list(columns), matrix)
+
+    # --- Ansichten ---
+    def matrix(self, years=None):
+        """Werte als (Gebiete x Jahre)-Array, optional nur für die angegebenen Zensusjahre."""
+        if years is None:
+            return self._matrix
+        return self._matrix[:, [self._year_position(y) for y in years]]
+
+    def wide(self, years=None, with_units=True):
+        """Zurück ins Breitformat (population_<Jahr>-Spalten), optional mit den Stammdaten davor."""
+        years = self.years if years is None else years
+        values = pd.DataFrame(self.matrix(years), columns=[population_column(y) for y in years], index=self.units.index)
+        return self.units.join(values) if with_units else values
+
+    def long(self):
+        return self.series.reset_index()
+
+    def unit(self, unit_id):
+        """Zeitreihe eines Gebiets (Index: Jahr)."""
+        return pd.Series(self._matrix[unit_id], index=self.years, name=VALUE_COL)
+
+    # --- Vektorisierte Zeitreihen-Operationen ---
+    def _year_position(self, year):
+        positions = np.flatnonzero(self.years == year)
+        if not len(positions):
+            raise KeyError(f"No census column for year {year}.")
+        return positions[0]
+
+    def deltas(self):
+        """Veränderung gegenüber dem vorherigen Zensusjahr je Gebiet (Langform, erstes Jahr NaN)."""
+        return self.series.groupby(level=UNIT_COL).diff()
+
+    def growth(self, start_year, end_year):
+        """Wachstum in % zwischen zwei beliebigen Zensusjahren; Startwert 0 oder NaN ergibt NaN."""
+        start = self._matrix[:, self._year_position(start_year)]
+        end = self._matrix[:, self._year_position(end_year)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.where(~np.isnan(start) & (start != 0), (end - start) / start * 100, np.nan)
+        return pd.Series(rate, index=self.units.index, name=f"growth_{start_year}_{end_year}")
+
+    def interpolate(self, years):
+        """
+        Linear zwischen den Zensusjahren interpolierte Werte für beliebige Jahre, für alle Gebiete
+        auf einmal (Gebiete x Jahre). Jahre außerhalb der Zensusspanne ergeben NaN.
+        """
+        years = np.asarray(years, dtype=float)
+        if len(self.years) == 0:
+            return pd.DataFrame(index=self.units.index, columns=years.astype(int))
+        if len(self.years) == 1:
+            # Nur ein Zensusjahr: genau dieses Jahr hat Werte, alle anderen NaN
+            values = np.where(years[None, :] == self.years[0], self._matrix[:, [0]], np.nan)
+            return pd.DataFrame(values, index=self.units.index, columns=years.astype(int))
+        right = np.clip(np.searchsorted(self.years, years, side="left"), 1, len(self.years) - 1)
+        left = right - 1
+        span = (self.years[right] - self.years[left]).astype(float)
+        weight = np.divide(years - self.years[left], span, out=np.zeros_like(years), where=span != 0)
+        values = self._matrix[:, left] * (1 - weight) + self._matrix[:, right] * weight
+        outside = (years < self.years[0]) | (years > self.years[-1])
+        values[:, outside] = np.nan
+        return pd.DataFrame(values, index=self.units.index, columns=years.astype(int))
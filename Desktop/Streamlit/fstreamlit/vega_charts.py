@@ -0,0 +1,81 @@
+# fstreamlit/vega_charts.py
+"""Clientseitige Varianten der Diagramme (Altair/Vega-Lite): nur benötigte Spalten, große Daten vorher ausgedünnt."""
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from fstreamlit import downsample
+from fstreamlit.analysis import GROWTH_RATE_COL, NAME_COL, POP_1996_COL, POP_2023_COL
+
+MAX_LINE_POINTS = 1000
+MAX_SCATTER_POINTS = 5000
+
+
+def density_trend(years, density_values):
+    data = pd.DataFrame({"year": list(years), "density": list(density_values)})
+    keep = downsample.lttb_indices(data["year"], data["density"], MAX_LINE_POINTS)
+    return alt.Chart(data.iloc[keep], title="Population Density in Egypt Over the Years").mark_line(point=True).encode(
+        x=alt.X("year:O", title="Year"),
+        y=alt.Y("density:Q", title="Population Density (persons/km²)", axis=alt.Axis(format="d")),
+        tooltip=["year", alt.Tooltip("density:Q", format=",.0f")],
+    )
+
+
+def population_projection(years, values, projection_years, projected_values, title):
+    data = pd.concat([
+        pd.DataFrame({"year": list(years), "population": list(values), "kind": "Census / estimate"}),
+        pd.DataFrame({"year": [years[-1], *projection_years], "population": [values[-1], *projected_values], "kind": "Projection"}),
+    ])
+    return alt.Chart(data, title=title).mark_line(point=True).encode(
+        x=alt.X("year:O", title="Year"),
+        y=alt.Y("population:Q", title="Population", axis=alt.Axis(format=",d")),
+        color=alt.Color("kind:N", title=None),
+        strokeDash=alt.StrokeDash("kind:N", legend=None),
+        tooltip=["year", "kind", alt.Tooltip("population:Q", format=",.0f")],
+    )
+
+
+def _growth_bars(data, title, color):
+    data = data[[NAME_COL, GROWTH_RATE_COL]]
+    return alt.Chart(data, title=title).mark_bar(color=color).encode(
+        x=alt.X(f"{GROWTH_RATE_COL}:Q", title="Growth Rate (%)"),
+        y=alt.Y(f"{NAME_COL}:N", title="Area", sort="-x"),
+        tooltip=[NAME_COL, alt.Tooltip(f"{GROWTH_RATE_COL}:Q", format=".1f")],
+    )
+
+
+def top_growth(top_growth_sorted):
+    return _growth_bars(top_growth_sorted, "Top 10 Areas by Population Growth Rate (1996 - 2023)", "#3b528b")
+
+
+def bottom_growth(low_growth_plot):
+    return _growth_bars(low_growth_plot, "Bottom 10 Areas by Population Growth Rate (1996 - 2023)", "salmon")
+
+
+def top_cities(top_10_cities_sorted):
+    data = top_10_cities_sorted[[NAME_COL, POP_2023_COL]]
+    return alt.Chart(data, title="Top 10 Cities/Areas by Population in 2023").mark_bar().encode(
+        x=alt.X(f"{NAME_COL}:N", title="City/Area", sort="-y", axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y(f"{POP_2023_COL}:Q", title="Population in 2023", axis=alt.Axis(format=",d")),
+        color=alt.Color(f"{NAME_COL}:N", scale=alt.Scale(scheme="viridis"), legend=None),
+        tooltip=[NAME_COL, alt.Tooltip(f"{POP_2023_COL}:Q", format=",.0f")],
+    )
+
+
+def scatter_1996_2023(df_for_scatter):
+    data = downsample.grid_downsample(df_for_scatter[[NAME_COL, POP_1996_COL, POP_2023_COL]], POP_1996_COL, POP_2023_COL, MAX_SCATTER_POINTS)
+    # Spaltenweise Maxima ohne NaN; max() würde NaN liefern, sobald eine Spalte ganz leer ist
+    column_max = data[[POP_1996_COL, POP_2023_COL]].max().to_numpy(dtype=float, na_value=np.nan)
+    points = alt.Chart(data, title="Population in 1996 vs 2023 (Excluding Egypt Total if identified)").mark_circle(
+        color="dodgerblue", opacity=0.7, stroke="black", strokeWidth=0.5
+    ).encode(
+        x=alt.X(f"{POP_1996_COL}:Q", title="Population 1996", axis=alt.Axis(format=",d")),
+        y=alt.Y(f"{POP_2023_COL}:Q", title="Population 2023", axis=alt.Axis(format=",d")),
+        size=alt.Size("count:Q", legend=None) if data["count"].max() > 1 else alt.value(40),
+        tooltip=[NAME_COL, alt.Tooltip(f"{POP_1996_COL}:Q", format=",.0f"), alt.Tooltip(f"{POP_2023_COL}:Q", format=",.0f"), "count"],
+    )
+    if np.isnan(column_max).all():
+        return points  # keine Werte in beiden Spalten: keine Diagonale
+    upper = float(np.nanmax(column_max))
+    diagonal = alt.Chart(pd.DataFrame({"v": [0.0, upper]})).mark_line(color="red", strokeDash=[6, 4], opacity=0.75).encode(x="v:Q", y="v:Q")
+    return diagonal + points
@@ -1,9 +1,7 @@
 # pages/4_📄_Cleaned_Text.py
 import streamlit as st
 import requests
-from bs4 import BeautifulSoup
-import re
-import pandas as pd # Benötigt für pd.isna
+from fstreamlit import app_cache, fetch, preview
 
 # --- Seitenkonfiguration ---
 st.set_page_config(page_title="Egypt Population - Cleaned Text", layout="wide", page_icon="📄")
@@ -11,54 +9,39 @@ st.set_page_config(page_title="Egypt Population - Cleaned Text", layout="wide",
 st.title("📄 Cleaned Text Artifacts from Page")
 st.caption("Extracted and cleaned text from paragraph tags on the source page.")
 
-# --- Funktion zum Bereinigen von HTML (hier zur Unabhängigkeit kopiert) ---
-@st.cache_data(ttl=3600) # Cacht das Ergebnis der Textbereinigung
-def get_and_clean_paragraphs(url):
-    """Ruft die URL ab, extrahiert Absätze und bereinigt deren Text."""
-    try:
-        response_text = requests.get(url, timeout=10)
-        response_text.raise_for_status()
-        soup_text = BeautifulSoup(response_text.content, 'lxml')
-        all_paragraphs = soup_text.find_all('p') # Findet alle <p>-Tags
-        cleaned_texts = []
+PARAGRAPHS_PER_PAGE = (10, 25, 50)
 
-        def clean_html_artifacts(text):
-            if pd.isna(text) or str(text).strip() == '':
-                return None
-            soup = BeautifulSoup(str(text), 'lxml') # Verwendet lxml
-            for tag in soup(['script', 'style']): # Entfernt Skript- und Stil-Tags
-                tag.decompose()
-            cleaned_text = soup.get_text(separator=' ', strip=True) # Holt Text, entfernt überschüssige Leerzeichen
-            cleaned_text = re.sub(r'&[a-zA-Z0-9#]+;', ' ', cleaned_text) # Entfernt HTML-Entitäten
-            cleaned_text = re.sub(r'<[^>]+>', '', cleaned_text) # Entfernt verbleibende Tags
-            return cleaned_text if cleaned_text.strip() else None # Gibt None zurück, wenn nach Bereinigung leer
-
-        for p_tag in all_paragraphs:
-            raw_text = p_tag.get_text(separator=' ', strip=True)
-            cleaned = clean_html_artifacts(raw_text)
-            if cleaned:
-                cleaned_texts.append(cleaned)
-        return cleaned_texts
-
-    except requests.exceptions.RequestException as e:
-        st.error(f"Fehler beim Abrufen der URL für Text: {e}")
-        return None
-    except Exception as e:
-         st.error(f"Fehler beim Extrahieren/Bereinigen von Textartefakten: {e}")
-         return None
+# --- Abruf (gecacht); die Absätze selbst werden über den Inhalts-Hash geteilt (fstreamlit.paragraphs) ---
+@st.cache_data(ttl=3600)
+def fetch_source_page(url):
+    """Ruft die Quellseite ab (geteilter Abruf mit Revalidierung, wie auf der Startseite)."""
+    return fetch.fetch_page(url)
 
 # --- Text extrahieren und anzeigen ---
-url = "https://www.citypopulation.de/en/egypt/admin/" # Definiert URL erneut
-cleaned_paragraphs = get_and_clean_paragraphs(url)
+url = fetch.SOURCE_URL
+try:
+    cleaned_paragraphs = app_cache.page_paragraphs(fetch_source_page(url))
+except requests.exceptions.RequestException as e:
+    st.error(f"Fehler beim Abrufen der URL für Text: {e}")
+    cleaned_paragraphs = None
+except Exception as e:
+    st.error(f"Fehler beim Extrahieren/Bereinigen von Textartefakten: {e}")
+    cleaned_paragraphs = None
 
 if cleaned_paragraphs:
     st.info(f"Found and cleaned {len(cleaned_paragraphs)} paragraphs.")
-    for i, text in enumerate(cleaned_paragraphs): # Zeigt alle bereinigten Absätze an
-        st.markdown(f"**Paragraph {i+1}:**")
-        st.text_area(f"P{i+1}", text, height=100, disabled=True, label_visibility="collapsed") # Zeigt Text in einer deaktivierten Textarea an
+    # Seitenweise Anzeige: pro Lauf nur die Absätze der aktuellen Seite, keine Widgets je Absatz
+    col_size, col_page = st.columns([1, 3])
+    page_size = col_size.selectbox("Paragraphs per page", PARAGRAPHS_PER_PAGE)
+    n_pages = preview.page_count(len(cleaned_paragraphs), page_size)
+    page = col_page.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+    start = (page - 1) * page_size
+    for i, text in enumerate(cleaned_paragraphs[start:start + page_size], start=start + 1):
+        st.markdown(f"**Paragraph {i}:**")
+        st.text(text)
         st.markdown("---")
 elif cleaned_paragraphs is None:
-    # Fehler wurde bereits in der Funktion angezeigt
+    # Fehler wurde bereits oben angezeigt
     pass
 else:
-    st.info("No relevant text paragraphs found or extracted after cleaning.")
\ No newline at end of file
+    st.info("No relevant text paragraphs found or extracted after cleaning.")
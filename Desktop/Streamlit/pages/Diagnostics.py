@@ -0,0 +1,91 @@
+# pages/5_🩺_Diagnostics.py
+import streamlit as st
+import pandas as pd
+from fstreamlit import app_cache, telemetry
+
+st.set_page_config(page_title="Egypt Population - Diagnostics", layout="wide", page_icon="🩺")
+
+st.title("🩺 Diagnostics")
+st.caption(f"Timing spans of the last {telemetry.RING_SIZE} pipeline, analysis and chart stages (all sessions of this process).")
+
+# --- Zeit je Stufe ---
+st.header("Stage Timings")
+summary = telemetry.stage_summary()
+if summary is not None:
+    st.dataframe(summary.style.format({
+        "mean_ms": '{:,.1f}', "p50_ms": '{:,.1f}', "p95_ms": '{:,.1f}', "max_ms": '{:,.1f}', "last_ms": '{:,.1f}'
+    }))
+    with st.expander("Recent spans"):
+        recent = pd.DataFrame(telemetry.recent(limit=200))
+        recent["started_at"] = pd.to_datetime(recent["started_at"], unit="s")
+        recent["ms"] = recent.pop("seconds") * 1000
+        st.dataframe(recent, hide_index=True)
+else:
+    st.info("No timings recorded yet. Load data on the Home page or open the Analysis/Visualizations pages.")
+
+# --- Cache-Treffer ---
+st.header("Cache Hits and Misses")
+stats = app_cache.cache_stats()
+if stats:
+    cache_table = pd.DataFrame.from_dict(stats, orient="index")
+    cache_table["hit_rate"] = cache_table["hits"] / (cache_table["hits"] + cache_table["misses"]).where(lambda total: total > 0)
+    st.dataframe(cache_table.style.format({"hit_rate": '{:.0%}', "bytes": '{:,.0f}'}))
+else:
+    st.info("No cache lookups recorded yet.")
+
+# --- Geteilter Speicher (alle Sitzungen) ---
+st.header("Shared Store")
+store_summary = app_cache.store().summary()
+col_budget, col_derived, col_datasets = st.columns(3)
+col_budget.metric("Budget", f"{store_summary['budget_bytes'] / 1024**2:,.0f} MB")
+col_derived.metric(
+    "Derived objects", f"{store_summary['derived_bytes'] / 1024**2:,.2f} MB",
+    f"{store_summary['derived_entries']} entries", delta_color="off"
+)
+col_datasets.metric(
+    "Shared datasets", f"{store_summary['dataset_bytes'] / 1024**2:,.2f} MB",
+    f"{store_summary['dataset_versions']} versions", delta_color="off"
+)
+sessions = app_cache.store().session_usage()
+if sessions:
+    st.write("Memory referenced per session (shared objects count for every session that uses them):")
+    st.dataframe(
+        pd.DataFrame(sessions).style.format({"dataset_bytes": '{:,.0f}', "derived_bytes": '{:,.0f}', "idle_seconds": '{:,.0f}'}),
+        hide_index=True
+    )
+
+# --- Datenquellen (Circuit Breaker) ---
+st.header("Data Sources")
+source_status = app_cache.prefetcher().coordinator.status()
+st.caption("Sources are started in order; the next one is added after the hedge delay or as soon as one fails. "
+           "A source that keeps failing is skipped until its retry time has passed.")
+st.dataframe(
+    pd.DataFrame.from_dict(source_status, orient="index").style.format({"retry_in_seconds": '{:,.0f}'}, na_rep="-")
+)
+
+# --- Speicher dieser Sitzung ---
+st.header("Session State Memory")
+usage = telemetry.session_memory(st.session_state.to_dict())
+if usage:
+    st.metric("Total (this session)", f"{sum(usage.values()) / 1024**2:,.2f} MB")
+    st.caption("Objects shared through the cross-session caches are counted here as well.")
+    st.dataframe(
+        pd.DataFrame({"key": list(usage), "bytes": list(usage.values())}).style.format({"bytes": '{:,.0f}'}),
+        hide_index=True
+    )
+else:
+    st.info("Session state is empty.")
+
+# --- Export ---
+st.header("Export")
+if telemetry.EXPORT_PATH:
+    st.write(f"Spans are also appended as JSON lines to `{telemetry.EXPORT_PATH}`.")
+else:
+    st.write("Set `FSTREAMLIT_TELEMETRY_LOG=/path/to/spans.jsonl` to append every span to a JSON-lines file.")
+col_download, col_clear = st.columns(2)
+col_download.download_button(
+    "Download spans (JSON lines)", telemetry.to_jsonl(), file_name="fstreamlit_spans.jsonl", mime="application/x-ndjson"
+)
+if col_clear.button("Clear spans"):
+    telemetry.clear()
+    st.rerun()